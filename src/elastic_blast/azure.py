@@ -16,6 +16,8 @@ Authors: Moon Hyuk Choi moonchoi@microsoft.com
 import base64
 import concurrent.futures
 import fcntl
+import hashlib
+import json
 import logging
 import math
 import os
@@ -27,7 +29,7 @@ import tempfile
 import threading
 import time
 import uuid
-from collections import defaultdict
+from collections import Counter, defaultdict
 from dataclasses import dataclass
 from enum import Enum
 from functools import lru_cache
@@ -36,18 +38,13 @@ from pathlib import Path
 from tempfile import TemporaryDirectory
 from timeit import default_timer as timer
 from types import MappingProxyType
-from typing import Any, DefaultDict, Dict, Iterable, List, Mapping, Optional, Tuple
+from typing import TYPE_CHECKING, Any, DefaultDict, Dict, Iterable, List, Mapping, Optional, Set, Tuple
 
 import requests
 from azure.core.exceptions import (  # type: ignore
     HttpResponseError,
     ResourceNotFoundError,
 )
-from azure.identity import DefaultAzureCredential  # type: ignore
-from azure.mgmt.authorization import AuthorizationManagementClient  # type: ignore
-from azure.mgmt.compute import ComputeManagementClient  # type: ignore
-from azure.mgmt.containerservice import ContainerServiceClient  # type: ignore
-from azure.mgmt.storage import StorageManagementClient  # type: ignore
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from . import VERSION, kubernetes
@@ -62,6 +59,7 @@ from .constants import (
     AKS_PROVISIONING_STATE,
     CLUSTER_ERROR,
     DEPENDENCY_ERROR,
+    ELB_DEPENDENCY_CHECK_TIMEOUT,
     ELB_DFLT_BLAST_JOB_AKS_TEMPLATE,
     ELB_LOCAL_SSD_BLAST_JOB_AKS_TEMPLATE,
     ELB_METADATA_DIR,
@@ -97,42 +95,58 @@ from .util import (
     safe_exec,
 )
 
+if TYPE_CHECKING:
+    from azure.mgmt.authorization import AuthorizationManagementClient  # type: ignore
+    from azure.mgmt.compute import ComputeManagementClient  # type: ignore
+    from azure.mgmt.containerservice import ContainerServiceClient  # type: ignore
+    from azure.mgmt.storage import StorageManagementClient  # type: ignore
+
 # ===========================================================================
 # Azure SDK Clients
 # ===========================================================================
 
 class AzureClients:
-    """Lazy-initialized Azure SDK clients using DefaultAzureCredential."""
+    """Lazy-initialized Azure SDK clients using DefaultAzureCredential.
+
+    The identity and management SDKs are imported on first use: they add
+    a few hundred milliseconds to start-up, which commands that never
+    talk to ARM (``--help``, dry runs, other clouds) should not pay.
+    """
 
     def __init__(self, subscription_id: str):
+        from azure.identity import DefaultAzureCredential  # type: ignore
         self._subscription_id = subscription_id
         self._credential = DefaultAzureCredential()
-        self._aks: Optional[ContainerServiceClient] = None
-        self._compute: Optional[ComputeManagementClient] = None
-        self._storage: Optional[StorageManagementClient] = None
-        self._auth: Optional[AuthorizationManagementClient] = None
+        self._aks: Optional['ContainerServiceClient'] = None
+        self._compute: Optional['ComputeManagementClient'] = None
+        self._storage: Optional['StorageManagementClient'] = None
+        self._auth: Optional['AuthorizationManagementClient'] = None
 
     @property
-    def aks(self) -> ContainerServiceClient:
+    def aks(self) -> 'ContainerServiceClient':
         if self._aks is None:
+            from azure.mgmt.containerservice import ContainerServiceClient  # type: ignore
             self._aks = ContainerServiceClient(self._credential, self._subscription_id)
         return self._aks
 
     @property
-    def compute(self) -> ComputeManagementClient:
+    def compute(self) -> 'ComputeManagementClient':
         if self._compute is None:
+            from azure.mgmt.compute import ComputeManagementClient  # type: ignore
             self._compute = ComputeManagementClient(self._credential, self._subscription_id)
         return self._compute
 
     @property
-    def storage(self) -> StorageManagementClient:
+    def storage(self) -> 'StorageManagementClient':
         if self._storage is None:
+            from azure.mgmt.storage import StorageManagementClient  # type: ignore
             self._storage = StorageManagementClient(self._credential, self._subscription_id)
         return self._storage
 
     @property
-    def auth(self) -> AuthorizationManagementClient:
+    def auth(self) -> 'AuthorizationManagementClient':
         if self._auth is None:
+            from azure.mgmt.authorization import AuthorizationManagementClient  # type: ignore
             self._auth = AuthorizationManagementClient(self._credential, self._subscription_id)
         return self._auth
 
@@ -150,7 +164,8 @@ _kubeconfig_thread_lock = threading.Lock()
 
 
 def _get_subscription_id() -> str:
-    """Get Azure subscription ID from az CLI profile or Azure REST API.
+    """Get Azure subscription ID from AZURE_SUBSCRIPTION_ID, the az CLI
+    profile or the Azure REST API, in that order.
 
     Result is cached for the life of the process — the subscription id
     is fixed once an `AzureClients` instance is bound to it, so re-querying
@@ -169,6 +184,11 @@ _SUBSCRIPTION_ID_CACHE: Dict[str, str] = {}
 
 
 def _resolve_subscription_id_uncached() -> str:
+    # The standard Azure SDK variable avoids bootstrapping the az CLI,
+    # which alone takes a second or more.
+    env_sub_id = os.environ.get('AZURE_SUBSCRIPTION_ID', '').strip()
+    if env_sub_id:
+        return env_sub_id
     try:
         result = subprocess.run(
             ['az', 'account', 'show', '--query', 'id', '-o', 'tsv'],
@@ -177,6 +197,7 @@ def _resolve_subscription_id_uncached() -> str:
             return result.stdout.strip()
     except (FileNotFoundError, subprocess.TimeoutExpired):
         pass
+    from azure.identity import DefaultAzureCredential  # type: ignore
     credential = DefaultAzureCredential()
     token = credential.get_token("https://management.azure.com/.default")
     # Always pass an explicit timeout: ARM is healthy in seconds, never
@@ -343,7 +364,7 @@ def _sdk_get_aks_credentials(resource_group: str, cluster_name: str, dry_run: bo
                 # Read the current-context from the freshly merged kubeconfig
                 # under the same lock so a concurrent writer cannot overwrite
                 # it before we observe the value we just wrote.
-                p = safe_exec('kubectl config current-context'.split())
+                p = safe_exec(['kubectl', 'config', 'current-context'])
             finally:
                 fcntl.flock(lock_f.fileno(), fcntl.LOCK_UN)
     finally:
@@ -379,25 +400,20 @@ def _sdk_set_role_assignments(resource_group: str, cluster_name: str,
         return
     clients = _get_clients()
     sub_id = clients.subscription_id
-    cluster = clients.aks.managed_clusters.get(resource_group, cluster_name)
-    kubelet_id = cluster.identity_profile["kubeletidentity"].object_id
-
-    sa = clients.storage.storage_accounts.get_properties(resource_group, storage_account)
     acr_id = f'/subscriptions/{sub_id}/resourceGroups/{acr_resource_group}/providers/Microsoft.ContainerRegistry/registries/{acr_name}'
+    # Resolve the auth client before fanning out so threads share one.
+    auth = clients.auth
 
     ROLE_DEFS = {
         'Storage Blob Data Contributor': 'ba92f5b4-2d11-453d-a403-e96b0029c9fe',
         'AcrPull': '7f951dda-4ed3-4680-a7ca-43fe172d538d',
         'Contributor': 'b24988ac-6180-42a0-ab88-20f7382dd24c',
     }
-    for role_name, scope in [
-        ('Storage Blob Data Contributor', sa.id),
-        ('AcrPull', acr_id),
-        ('Contributor', f'/subscriptions/{sub_id}'),
-    ]:
+
+    def create(role_name: str, scope: str, kubelet_id: str) -> None:
         role_def_id = f'/subscriptions/{sub_id}/providers/Microsoft.Authorization/roleDefinitions/{ROLE_DEFS[role_name]}'
         try:
-            clients.auth.role_assignments.create(
+            auth.role_assignments.create(
                 scope, str(uuid.uuid4()),
                 {"role_definition_id": role_def_id, "principal_id": kubelet_id,
                  "principal_type": "ServicePrincipal"})
@@ -411,12 +427,32 @@ def _sdk_set_role_assignments(resource_group: str, cluster_name: str,
             err_code = getattr(e, 'error', None)
             err_code_value = getattr(err_code, 'code', None) if err_code else None
             if err_code_value == 'RoleAssignmentExists':
-                continue
+                return
             if getattr(e, 'status_code', None) == 409 and 'RoleAssignmentExists' in (
                     getattr(e, 'message', '') or ''):
-                continue
+                return
             raise
 
+    # The two lookups are independent, and so are the three assignments
+    # once both lookups are back: run each phase concurrently.
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=3,
+        thread_name_prefix='elb-role-assign',
+    ) as pool:
+        cluster_fut = pool.submit(clients.aks.managed_clusters.get, resource_group, cluster_name)
+        sa_fut = pool.submit(clients.storage.storage_accounts.get_properties,
+                             resource_group, storage_account)
+        kubelet_id = cluster_fut.result().identity_profile["kubeletidentity"].object_id
+        sa_id = sa_fut.result().id
+        futures = [pool.submit(create, role_name, scope, kubelet_id)
+                   for role_name, scope in [
+                       ('Storage Blob Data Contributor', sa_id),
+                       ('AcrPull', acr_id),
+                       ('Contributor', f'/subscriptions/{sub_id}'),
+                   ]]
+        for fut in futures:
+            fut.result()
+
 
 @retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))  # type: ignore
 def _sdk_get_disks(resource_group: str, dry_run: bool = False) -> List[str]:
@@ -448,7 +484,7 @@ def _sdk_delete_snapshot(resource_group: str, snapshot_name: str) -> None:
 
 def _sdk_check_prerequisites() -> None:
     try:
-        p = safe_exec('kubectl version --output=json --client=true')
+        p = safe_exec('kubectl version --output=json --client=true', timeout=ELB_DEPENDENCY_CHECK_TIMEOUT)
         logging.debug(f'{":".join(p.stdout.decode().split())}')
     except SafeExecError as e:
         raise UserReportError(DEPENDENCY_ERROR,
@@ -456,6 +492,7 @@ def _sdk_check_prerequisites() -> None:
     if shutil.which('azcopy') is None:
         raise UserReportError(DEPENDENCY_ERROR,
             "Required pre-requisite 'azcopy' is not installed.")
+    from azure.identity import DefaultAzureCredential  # type: ignore
     try:
         DefaultAzureCredential().get_token("https://management.azure.com/.default")
     except Exception as e:
@@ -764,6 +801,37 @@ def apply_profile(cfg, profile: Optional[OptimizationProfile] = None,
 # ElasticBlastAzure — main class
 # ---------------------------------------------------------------------------
 
+# Upper bound (seconds) on a single ``kubectl wait`` in
+# wait_for_cloud_query_split; also bounds how late a failed Job is noticed.
+_CLOUD_SPLIT_WAIT_SLICE_S = 30
+# Concurrent ``kubectl label`` calls issued by _label_nodes.
+_LABEL_NODES_MAX_WORKERS = 16
+# How long (seconds) the AKS status prefetched by _prefetch_cluster_status
+# may be used in place of a fresh check_cluster call.
+_CLUSTER_STATUS_PREFETCH_TTL_S = 120
+# AKS provisioning states reported by _check_status as still submitting.
+_AKS_STATUS_SUBMITTING_STATES = frozenset({
+    AKS_PROVISIONING_STATE.UPDATING.value,
+    AKS_PROVISIONING_STATE.CREATING.value,
+    AKS_PROVISIONING_STATE.STARTING.value,
+})
+# ``<active>|<failed>`` counts of a single Job, polled by
+# wait_for_cloud_query_split.
+_JP_JOB_ACTIVE_FAILED = '{.status.active}|{.status.failed}'
+# kubectl arguments of the combined BLAST jobs,pods query in
+# _count_blast_jobs: one ``<kind>\t<first job condition>\t<pod phase>``
+# line per object.
+_BLAST_JOB_POD_ROWS_ARGS = (
+    'get', 'jobs,pods', '-l', 'app=blast',
+    '-o', 'jsonpath={range .items[*]}{.kind}{"\\t"}'
+          '{.status.conditions[0].type}{"\\t"}{.status.phase}{"\\n"}{end}',
+)
+# One row of the _BLAST_JOB_POD_ROWS_ARGS output.
+_JOB_POD_ROW_RE = re.compile(r'^(Job|Pod)\t([^\t\n]*)\t([^\t\n]*)$', re.M)
+# First column of each non-empty ``custom-columns`` output line.
+_JOB_CONDITION_RE = re.compile(r'^[ \t]*(\S+)', re.M)
+
+
 class ElasticBlastAzure(ElasticBlast):
     """Azure AKS implementation of ElasticBLAST."""
 
@@ -781,6 +849,50 @@ class ElasticBlastAzure(ElasticBlast):
         self.query_files: List[str] = []
         self.cluster_initialized = False
         self.auto_shutdown = 'ELB_DISABLE_AUTO_SHUTDOWN' not in os.environ
+        # Memoized _build_substitutions results
+        self._subs_cache: Dict[Tuple[bool, str, str, str], Dict[str, str]] = {}
+        # Metadata files queued by _queue_metadata until _flush_metadata
+        self._pending_metadata: Dict[str, str] = {}
+        # AKS status lookup started by _prefetch_cluster_status
+        self._cluster_status_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._cluster_status_prefetch: Optional[concurrent.futures.Future] = None
+        self._cluster_status_prefetched_at = 0.0
+
+    def _prefetch_cluster_status(self) -> None:
+        """Start the ARM status lookup that cluster initialization begins
+        with, so that it overlaps with the work preceding initialization.
+
+        Only called on paths that go on to initialize the cluster, where
+        _initial_cluster_status consumes the result.
+        """
+        if self.dry_run or self.cluster_initialized or self._cluster_status_pool:
+            return
+        self._cluster_status_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='elb-cluster-status')
+        self._cluster_status_prefetch = self._cluster_status_pool.submit(check_cluster, self.cfg)
+        self._cluster_status_prefetched_at = time.monotonic()
+
+    def _initial_cluster_status(self) -> str:
+        """Return the AKS provisioning state at the start of initialization.
+
+        Uses the prefetched lookup when it is recent enough and succeeded;
+        otherwise queries ARM. The prefetch is used at most once and its
+        worker thread is joined here, before any jobs are rendered.
+        """
+        prefetch, self._cluster_status_prefetch = self._cluster_status_prefetch, None
+        pool, self._cluster_status_pool = self._cluster_status_pool, None
+        status = None
+        if prefetch is not None:
+            age = time.monotonic() - self._cluster_status_prefetched_at
+            try:
+                result = prefetch.result()
+                if age < _CLUSTER_STATUS_PREFETCH_TTL_S:
+                    status = result
+            except Exception as err:
+                logging.debug(f'Prefetched cluster status unavailable: {err}')
+        if pool is not None:
+            pool.shutdown(wait=True)
+        return check_cluster(self.cfg) if status is None else status
 
     def _safe_collect_logs(self) -> None:
         """Collect K8s logs only if the kubectl context is available."""
@@ -805,6 +917,11 @@ class ElasticBlastAzure(ElasticBlast):
         job cannot wedge the CLI forever — the previous loop only exited
         on success or job failure and would block indefinitely if the K8s
         Job got into a Pending state without progressing to Failed.
+
+        Completion is detected with ``kubectl wait``, which blocks on the
+        API server and returns as soon as the Job completes. The wait is
+        issued in short slices so that a failed Job (which never meets
+        ``condition=complete``) is still noticed promptly.
         """
         if not self.query_files:
             return
@@ -812,33 +929,81 @@ class ElasticBlastAzure(ElasticBlast):
 
         timeout_s = max(60, int(os.environ.get('ELB_CLOUD_QUERY_SPLIT_TIMEOUT_S', '7200')))
         deadline = time.monotonic() + timeout_s
+        backoff_s = 1.0
+        # Loop-invariant kubectl arguments.
+        wait_args = ('wait', f'job/{job}', '--for=condition=complete')
+        get_job = ('get', 'job', job)
         while True:
             if self.dry_run:
                 return
-            active = self._kubectl_jsonpath(f'get job {job}',
-                                            '{.items[?(@.status.active)].metadata.name}')
-            if not active:
-                failed = self._kubectl_jsonpath(f'get job {job}',
-                                               '{.items[?(@.status.failed)].metadata.name}')
-                if failed:
-                    msg = ('BLASTDB initialization failed' if job == K8S_JOB_INIT_PV
-                           else 'Cloud query splitting failed')
-                    raise UserReportError(returncode=CLUSTER_ERROR, message=msg)
-                return
-            if time.monotonic() >= deadline:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 raise UserReportError(
                     returncode=CLUSTER_ERROR,
                     message=(f'Cloud query split job {job} did not complete within '
                              f'{timeout_s}s. Inspect with: kubectl describe job {job}'))
-            time.sleep(30)
+            wait_s = max(1, int(min(remaining, _CLOUD_SPLIT_WAIT_SLICE_S)))
+            started = time.monotonic()
+            try:
+                self._kubectl_run(*wait_args, f'--timeout={wait_s}s',
+                                  timeout=wait_s + 30)
+                return
+            except SafeExecError:
+                pass
+            # Not complete within the slice (or kubectl hiccup): one poll
+            # for both signals, ``<active>|<failed>``.
+            active, _, failed = self._kubectl_jsonpath(
+                get_job, _JP_JOB_ACTIVE_FAILED).partition('|')
+            if not active.strip():
+                if failed.strip():
+                    msg = ('BLASTDB initialization failed' if job == K8S_JOB_INIT_PV
+                           else 'Cloud query splitting failed')
+                    raise UserReportError(returncode=CLUSTER_ERROR, message=msg)
+                return
+            # kubectl wait returning early means it errored rather than
+            # timed out; back off so a flapping API server is not hammered.
+            if time.monotonic() - started < wait_s:
+                time.sleep(min(backoff_s, max(0.0, deadline - time.monotonic())))
+                backoff_s = min(backoff_s * 2, _CLOUD_SPLIT_WAIT_SLICE_S)
+            else:
+                backoff_s = 1.0
 
     def upload_query_length(self, query_length: int) -> None:
         """Upload query length metadata to Blob Storage."""
         if query_length <= 0:
             return
-        fname = self._metadata_path(ELB_QUERY_LENGTH)
-        with open_for_write_immediate(fname) as f:
-            f.write(str(query_length))
+        # Uploaded together with num_jobs_submitted once submit() finishes.
+        self._queue_metadata(ELB_QUERY_LENGTH, str(query_length))
+
+    def _queue_metadata(self, filename: str, content: str) -> None:
+        """Stage a small metadata file for the next _flush_metadata call."""
+        self._pending_metadata[filename] = content
+
+    def _flush_metadata(self) -> None:
+        """Upload all queued metadata files with a single azcopy invocation.
+
+        The upload is best-effort: it runs from submit()'s ``finally`` block,
+        so a failure is logged rather than raised, leaving both a successful
+        submit and any exception already in flight untouched.
+        """
+        if not self._pending_metadata:
+            return
+        pending, self._pending_metadata = self._pending_metadata, {}
+        dest = self._metadata_path('')
+        with TemporaryDirectory() as tmpdir:
+            for filename, content in pending.items():
+                with open(os.path.join(tmpdir, filename), 'w', encoding='utf-8') as f:
+                    f.write(content)
+            cmd = ['azcopy', 'cp', f'{tmpdir}/*', dest, '--recursive=true']
+            if self.dry_run:
+                logging.info(' '.join(cmd))
+            else:
+                try:
+                    safe_exec(cmd)
+                except SafeExecError as e:
+                    logging.warning(f'Failed to upload metadata {sorted(pending)} to {dest}: {e.message}')
+                    return
+        logging.debug(f'Uploaded metadata {sorted(pending)} to {dest}')
 
     # -- Job submission -----------------------------------------------------
 
@@ -849,36 +1014,43 @@ class ElasticBlastAzure(ElasticBlast):
             raise UserReportError(returncode=INPUT_ERROR,
                 message='One-stage cloud query split is not supported on Azure.')
 
-        # Apply optimization profile and show prediction
-        self._show_optimization_prediction(query_batches, query_length)
+        try:
+            self._prefetch_cluster_status()
 
-        # Auto-partition if enabled
-        if self.cfg.blast.db_auto_partition and self.cfg.blast.db_partitions == 0:
-            plan = apply_auto_partition(self.cfg)
-            if plan and plan.db_partitions > 0:
-                logging.info(str(plan))
+            # Apply optimization profile and show prediction
+            self._show_optimization_prediction(query_batches, query_length)
 
-        if self.cfg.blast.db_partitions > 0:
-            return self._submit_partitioned(query_batches, query_length)
+            # Auto-partition if enabled
+            if self.cfg.blast.db_auto_partition and self.cfg.blast.db_partitions == 0:
+                plan = apply_auto_partition(self.cfg)
+                if plan and plan.db_partitions > 0:
+                    logging.info(str(plan))
 
-        if not self.cluster_initialized:
-            self._check_job_number_limit(query_batches, query_length)
-            self.query_files = []
-            self._initialize_cluster(query_batches)
-            self.cluster_initialized = True
+            if self.cfg.blast.db_partitions > 0:
+                return self._submit_partitioned(query_batches, query_length)
 
-        if self.cloud_job_submission:
-            kubernetes.submit_job_submission_job(self.cfg)
-        else:
-            self._generate_and_submit_jobs(query_batches)
-            if not self.cfg.cluster.use_local_ssd:
-                self._save_persistent_disk_ids()
+            if not self.cluster_initialized:
+                self._check_job_number_limit(query_batches, query_length)
+                self.query_files = []
+                self._initialize_cluster(query_batches)
+                self.cluster_initialized = True
 
-        # Deploy finalizer job to auto-detect completion and upload status marker
-        self._submit_finalizer_job()
+            if self.cloud_job_submission:
+                kubernetes.submit_job_submission_job(self.cfg)
+            else:
+                self._generate_and_submit_jobs(query_batches)
+                if not self.cfg.cluster.use_local_ssd:
+                    self._save_persistent_disk_ids()
 
-        self.cleanup_stack.clear()
-        self.cleanup_stack.append(lambda: self._safe_collect_logs())
+            # Deploy finalizer job to auto-detect completion and upload status marker
+            self._submit_finalizer_job()
+
+            self.cleanup_stack.clear()
+            self.cleanup_stack.append(lambda: self._safe_collect_logs())
+        finally:
+            # Query length is queued before submit(); upload it even if
+            # job submission fails so the run summary stays accurate.
+            self._flush_metadata()
 
     def prepare(self) -> None:
         """Prepare cluster: create AKS, download DB shards, warm cache.
@@ -889,6 +1061,8 @@ class ElasticBlastAzure(ElasticBlast):
         if not cfg.cluster.reuse:
             self.cleanup_stack.append(lambda: delete_cluster_with_cleanup(cfg, allow_missing=True))
 
+        self._prefetch_cluster_status()
+
         # Auto-partition if enabled
         if cfg.blast.db_auto_partition and cfg.blast.db_partitions == 0:
             plan = apply_auto_partition(cfg)
@@ -980,46 +1154,61 @@ class ElasticBlastAzure(ElasticBlast):
             return value.decode('utf-8', errors='replace')
         return str(value)
 
-    def _get_k8s_ctx(self) -> str:
-        """Get or cache kubectl context."""
+    def _get_k8s_ctx(self, use_disk_cache: bool = True) -> str:
+        """Get or cache kubectl context (in memory and, briefly, on disk).
+
+        Pass ``use_disk_cache=False`` where the cluster may have just been
+        (re)created, so that a context cached for a previous cluster with
+        the same name is never reused.
+        """
         if not self.cfg.appstate.k8s_ctx:
-            ctx = get_aks_credentials(self.cfg)
+            ctx = None
+            if use_disk_cache and not self.dry_run:
+                ctx = _load_cached_k8s_ctx(self.cfg)
             if not ctx:
-                raise UserReportError(returncode=CLUSTER_ERROR,
-                                      message='Failed to get AKS kubectl context')
+                ctx = get_aks_credentials(self.cfg)
+                if not ctx:
+                    raise UserReportError(returncode=CLUSTER_ERROR,
+                                          message='Failed to get AKS kubectl context')
+                if not self.dry_run:
+                    _save_cached_k8s_ctx(self.cfg, ctx)
             self.cfg.appstate.k8s_ctx = ctx
         return self.cfg.appstate.k8s_ctx
 
-    def _kubectl(self) -> str:
-        """Return kubectl command prefix with context (string form, legacy callers)."""
-        return f'kubectl --context={self._get_k8s_ctx()}'
-
     def _kubectl_argv(self) -> List[str]:
-        """Return kubectl argv prefix with context (preferred — list form)."""
+        """Return kubectl argv prefix with context."""
         return ['kubectl', f'--context={self._get_k8s_ctx()}']
 
-    def _kubectl_run(self, *args: str):
+    def _kubectl_run(self, *args: str, timeout: Optional[float] = 60):
         """Run kubectl with the cluster context and the supplied trailing args.
 
         ``args`` are passed verbatim as separate argv elements — never use a
         single shell-style string here. Returns the ``CompletedProcess`` from
         ``safe_exec`` so callers can inspect ``stdout`` / ``stderr``.
+        ``timeout`` is forwarded to ``safe_exec``; raise it for commands
+        that block server-side, such as ``kubectl wait``.
         """
-        return safe_exec([*self._kubectl_argv(), *args])
-
-    def _kubectl_jsonpath(self, resource_cmd, jsonpath: str) -> str:
+        try:
+            return safe_exec([*self._kubectl_argv(), *args], timeout=timeout)
+        except SafeExecError as e:
+            if not any(marker in e.message for marker in _KUBECTL_AUTH_ERRORS):
+                raise
+            # The context is stale (e.g. the cluster was recreated): drop
+            # it, fetch fresh credentials from ARM and retry once.
+            logging.debug(f'kubectl context rejected, refreshing credentials: {e.message}')
+            _drop_cached_k8s_ctx(self.cfg)
+            self.cfg.appstate.k8s_ctx = None
+            self._get_k8s_ctx(use_disk_cache=False)
+            return safe_exec([*self._kubectl_argv(), *args], timeout=timeout)
+
+    def _kubectl_jsonpath(self, resource_cmd: Iterable[str], jsonpath: str) -> str:
         """Run ``kubectl <resource_cmd...> -o jsonpath=<jsonpath>`` and return stdout text.
 
-        ``resource_cmd`` may be a list of argv parts (preferred) or a
-        whitespace-separated string (kept for the small number of legacy
-        call sites). ``jsonpath`` is passed as a single argv element so its
-        braces and quotes are never seen by a shell.
+        ``resource_cmd`` is a sequence of argv parts. ``jsonpath`` is passed
+        as a single argv element so its braces and quotes are never seen by
+        a shell.
         """
-        if isinstance(resource_cmd, str):
-            resource_parts = resource_cmd.split()
-        else:
-            resource_parts = list(resource_cmd)
-        proc = self._kubectl_run(*resource_parts, '-o', f'jsonpath={jsonpath}')
+        proc = self._kubectl_run(*resource_cmd, '-o', f'jsonpath={jsonpath}')
         return handle_error(proc.stdout)
 
     def _kubectl_apply_template(self, template_relpath: str,
@@ -1086,9 +1275,17 @@ class ElasticBlastAzure(ElasticBlast):
                               results_path: str = '') -> Dict[str, str]:
         """Build template substitution dictionary.
 
-        Shared by both standard and partitioned job generation.
+        Shared by both standard and partitioned job generation. Results are
+        memoized per instance (the default DB lookup goes to the network);
+        callers get a fresh copy they may extend.
         """
         cfg = self.cfg
+        # The only dependence on query_batches is whether there is one
+        # batch per node (see the CPU allocation below).
+        key = (len(query_batches) == cfg.cluster.num_nodes, db, db_label, results_path)
+        cached = self._subs_cache.get(key)
+        if cached is not None:
+            return dict(cached)
         if not db:
             db, _, db_label = get_blastdb_info(cfg.blast.db)
         if not results_path:
@@ -1117,7 +1314,7 @@ class ElasticBlastAzure(ElasticBlast):
         if not ttl_seconds.isdigit():
             ttl_seconds = '1800'
 
-        return {
+        subs = {
             'ELB_BLAST_PROGRAM': program,
             'ELB_DB': db,
             'ELB_DB_LABEL': db_label,
@@ -1145,6 +1342,8 @@ class ElasticBlastAzure(ElasticBlast):
             'ELB_AZURE_RESOURCE_GROUP': cfg.azure.resourcegroup,
             'ELB_METADATA_DIR': ELB_METADATA_DIR,
         }
+        self._subs_cache[key] = subs
+        return dict(subs)
 
     # Keep backward-compatible names
     def job_substitutions(self, query_batches) -> Dict[str, str]:
@@ -1242,12 +1441,13 @@ class ElasticBlastAzure(ElasticBlast):
         """
         cfg = self.cfg
 
+        aks_status = self._initial_cluster_status()
+
         # Warm cluster shortcut
         if cfg.cluster.reuse:
-            status = check_cluster(cfg)
-            if status == AKS_PROVISIONING_STATE.SUCCEEDED.value and self._db_already_loaded():
+            if aks_status == AKS_PROVISIONING_STATE.SUCCEEDED.value and self._db_already_loaded():
                 logging.info('Warm cluster reuse: skipping init')
-                self._get_k8s_ctx()
+                self._get_k8s_ctx(use_disk_cache=False)
                 # Run the three independent warm-reuse steps in parallel so
                 # warm submits aren't gated by the slowest sequential op.
                 # _cleanup_stale_jobs (Jobs), create_scripts_configmap
@@ -1284,7 +1484,6 @@ class ElasticBlastAzure(ElasticBlast):
         self.cleanup_stack.append(lambda: self._safe_collect_logs())
 
         # Start cluster creation asynchronously
-        aks_status = check_cluster(cfg)
         poller = None
         if not cfg.cluster.reuse or not aks_status:
             poller = start_cluster_async(cfg)
@@ -1297,7 +1496,7 @@ class ElasticBlastAzure(ElasticBlast):
         if poller:
             wait_for_cluster(cfg, poller)
 
-        self._get_k8s_ctx()
+        self._get_k8s_ctx(use_disk_cache=False)
         self._label_nodes()
 
         if not cfg.cluster.reuse or not aks_status:
@@ -1315,6 +1514,8 @@ class ElasticBlastAzure(ElasticBlast):
         logging.info('Initializing storage')
         wait_mode = ElbExecutionMode.NOWAIT if self.cloud_job_submission else ElbExecutionMode.WAIT
         kubernetes.initialize_storage(cfg, self.query_files, wait_mode)
+        # initialize_storage rewrites the disk ID metadata.
+        _load_resource_ids.cache_clear()
 
         if cfg.cluster.reuse and not cfg.cluster.use_local_ssd:
             self._deploy_vmtouch_daemonset()
@@ -1336,7 +1537,7 @@ class ElasticBlastAzure(ElasticBlast):
             self.cleanup_stack.append(lambda: delete_cluster_with_cleanup(cfg, allow_missing=True))
         self.cleanup_stack.append(lambda: self._safe_collect_logs())
 
-        aks_status = check_cluster(cfg)
+        aks_status = self._initial_cluster_status()
         poller = None
         if not cfg.cluster.reuse or not aks_status:
             poller = start_cluster_async(cfg)
@@ -1347,7 +1548,7 @@ class ElasticBlastAzure(ElasticBlast):
         if poller:
             wait_for_cluster(cfg, poller)
 
-        self._get_k8s_ctx()
+        self._get_k8s_ctx(use_disk_cache=False)
         self._label_nodes()
 
         if not cfg.cluster.reuse or not aks_status:
@@ -1360,6 +1561,8 @@ class ElasticBlastAzure(ElasticBlast):
 
         wait_mode = ElbExecutionMode.NOWAIT if self.cloud_job_submission else ElbExecutionMode.WAIT
         kubernetes.initialize_storage_partitioned(cfg, self.query_files, wait_mode)
+        # initialize_storage_partitioned rewrites the disk ID metadata.
+        _load_resource_ids.cache_clear()
 
     # -- Partitioned search -------------------------------------------------
 
@@ -1409,7 +1612,7 @@ class ElasticBlastAzure(ElasticBlast):
             self.cleanup_stack.append(lambda: delete_cluster_with_cleanup(cfg, allow_missing=True))
         self.cleanup_stack.append(lambda: self._safe_collect_logs())
 
-        aks_status = check_cluster(cfg)
+        aks_status = self._initial_cluster_status()
         poller = None
         if not cfg.cluster.reuse or not aks_status:
             poller = start_cluster_async(cfg)
@@ -1421,7 +1624,7 @@ class ElasticBlastAzure(ElasticBlast):
         if poller:
             wait_for_cluster(cfg, poller)
 
-        self._get_k8s_ctx()
+        self._get_k8s_ctx(use_disk_cache=False)
         self._label_nodes()
 
         if not cfg.cluster.reuse or not aks_status:
@@ -1479,8 +1682,7 @@ class ElasticBlastAzure(ElasticBlast):
             kubernetes.submit_jobs(cfg.appstate.k8s_ctx, Path(job_path), dry_run=self.dry_run)
             logging.debug(f'RUNTIME submit-sharded-jobs {timer() - start:.1f}s')
 
-        with open_for_write_immediate(self._metadata_path(ELB_NUM_JOBS_SUBMITTED)) as f:
-            f.write(str(total))
+        self._queue_metadata(ELB_NUM_JOBS_SUBMITTED, str(total))
 
         track_search_submitted(
             job_id=cfg.azure.elb_job_id, program=cfg.blast.program,
@@ -1516,8 +1718,7 @@ class ElasticBlastAzure(ElasticBlast):
             kubernetes.submit_jobs(cfg.appstate.k8s_ctx, Path(job_path), dry_run=self.dry_run)
             logging.debug(f'RUNTIME submit-partitioned-jobs {timer() - start:.1f}s')
 
-        with open_for_write_immediate(self._metadata_path(ELB_NUM_JOBS_SUBMITTED)) as f:
-            f.write(str(total))
+        self._queue_metadata(ELB_NUM_JOBS_SUBMITTED, str(total))
 
         track_search_submitted(
             job_id=cfg.azure.elb_job_id, program=cfg.blast.program,
@@ -1544,8 +1745,7 @@ class ElasticBlastAzure(ElasticBlast):
             logging.debug(f'RUNTIME submit-jobs {elapsed:.1f}s '
                          f'({len(job_names) / max(elapsed, 0.1):.0f} jobs/sec)')
 
-            with open_for_write_immediate(self._metadata_path(ELB_NUM_JOBS_SUBMITTED)) as f:
-                f.write(str(len(job_names)))
+            self._queue_metadata(ELB_NUM_JOBS_SUBMITTED, str(len(job_names)))
 
             track_search_submitted(
                 job_id=cfg.azure.elb_job_id, program=cfg.blast.program,
@@ -1598,10 +1798,7 @@ class ElasticBlastAzure(ElasticBlast):
             return (ElbStatus.UNKNOWN, {},
                     {STATUS_MESSAGE_ERROR: f'Cluster "{self.cfg.cluster.name}" was not found'})
 
-        TRANSITIONAL = {AKS_PROVISIONING_STATE.UPDATING.value,
-                        AKS_PROVISIONING_STATE.CREATING.value,
-                        AKS_PROVISIONING_STATE.STARTING.value}
-        if aks_status in TRANSITIONAL:
+        if aks_status in _AKS_STATUS_SUBMITTING_STATES:
             return ElbStatus.SUBMITTING, {}, {}
 
         if aks_status != AKS_PROVISIONING_STATE.SUCCEEDED.value:
@@ -1629,24 +1826,27 @@ class ElasticBlastAzure(ElasticBlast):
         if self.dry_run:
             return counts
 
-        pending, succeeded, failed = self._job_status_by_app('blast')
-        counts['pending'] = pending
-        counts['succeeded'] = succeeded
-        counts['failed'] = failed
-
+        # One kubectl call returns both the BLAST Jobs and their Pods.
         try:
-            proc = self._kubectl_run(
-                'get', 'pods',
-                '-o', 'custom-columns=STATUS:.status.phase',
-                '-l', 'app=blast')
-            for line in handle_error(proc.stdout).split('\n'):
-                if line == 'Running':
-                    counts['running'] += 1
+            proc = self._kubectl_run(*_BLAST_JOB_POD_ROWS_ARGS)
+            # Count identical rows in C; only the handful of distinct
+            # (kind, condition, phase) rows are classified in Python.
+            rows = Counter(_JOB_POD_ROW_RE.findall(handle_error(proc.stdout)))
+            for (kind, condition, phase), n in rows.items():
+                if kind == 'Job':
+                    if condition == 'Complete':
+                        counts['succeeded'] += n
+                    elif condition == 'Failed':
+                        counts['failed'] += n
+                    else:
+                        counts['pending'] += n
+                elif phase == 'Running':
+                    counts['running'] += n
         except SafeExecError as e:
             # Tolerate transient kubectl failures here so a flaky API
             # server during ``elastic-blast status`` does not abort with a
             # raw stack trace; the next poll will retry.
-            logging.warning(f'_count_blast_jobs: pod query failed ({e}); reporting partial counts')
+            logging.warning(f'_count_blast_jobs: job/pod query failed ({e}); reporting partial counts')
         # Clamp to 0 to avoid going negative during scale-down races where
         # a Job's active count has already decremented but the pod hasn't
         # yet transitioned out of Running.
@@ -1662,35 +1862,35 @@ class ElasticBlastAzure(ElasticBlast):
         if counts['succeeded'] > 0:
             return ElbStatus.SUCCESS
 
-        # No blast jobs yet — check setup/submit
-        for app in ('setup', 'submit'):
-            _, _, failed = self._job_status_by_app(app)
-            if failed > 0:
-                return ElbStatus.FAILURE
+        # No blast jobs yet — check setup/submit with a single kubectl call.
+        _, _, failed = self._job_status_by_app('setup', 'submit')
+        if failed > 0:
+            return ElbStatus.FAILURE
         return ElbStatus.SUBMITTING
 
-    def _job_status_by_app(self, app: str) -> Tuple[int, int, int]:
-        """Count pending/succeeded/failed jobs for a given app label."""
-        pending = succeeded = failed = 0
+    @staticmethod
+    def _tally_job_conditions(conditions: Iterable[str]) -> Tuple[int, int, int]:
+        """Return (pending, succeeded, failed) for a stream of Job condition
+        types; anything other than Complete/Failed counts as pending."""
+        tally = Counter(conditions)
+        succeeded = tally['Complete']
+        failed = tally['Failed']
+        return sum(tally.values()) - succeeded - failed, succeeded, failed
+
+    def _job_status_by_app(self, *apps: str) -> Tuple[int, int, int]:
+        """Count pending/succeeded/failed jobs labelled with any of ``apps``."""
         if self.dry_run:
-            return pending, succeeded, failed
+            return 0, 0, 0
+        selector = f'app={apps[0]}' if len(apps) == 1 else f'app in ({",".join(apps)})'
         try:
             proc = self._kubectl_run(
-                'get', 'jobs',
+                'get', 'jobs', '--no-headers',
                 '-o', 'custom-columns=STATUS:.status.conditions[0].type',
-                '-l', f'app={app}')
-            for line in handle_error(proc.stdout).split('\n'):
-                if not line or line.startswith('STATUS'):
-                    continue
-                if line.startswith('Complete'):
-                    succeeded += 1
-                elif line.startswith('Failed'):
-                    failed += 1
-                else:
-                    pending += 1
+                '-l', selector)
         except SafeExecError:
-            pass
-        return pending, succeeded, failed
+            return 0, 0, 0
+        return self._tally_job_conditions(
+            _JOB_CONDITION_RE.findall(handle_error(proc.stdout)))
 
     # -- Cleanup ------------------------------------------------------------
 
@@ -1793,11 +1993,23 @@ class ElasticBlastAzure(ElasticBlast):
         # cannot be split across argument boundaries (defence-in-depth: AKS
         # node names are tightly constrained, but this avoids a fragile
         # f-string + .split() pattern).
-        names_out = self._kubectl_jsonpath(
-            ['get', 'nodes'], '{.items[*].metadata.name}')
-        for i, name in enumerate(names_out.split()):
-            self._kubectl_run('label', 'nodes', name,
-                              f'ordinal={i}', '--overwrite')
+        names = self._kubectl_jsonpath(
+            ['get', 'nodes'], '{.items[*].metadata.name}').split()
+        if not names:
+            return
+        # Each label is an independent API call; issue them concurrently,
+        # bounded so a large node pool does not flood the API server.
+        # ``kubectl label`` only modifies existing nodes, so a node scaled
+        # away since the listing fails instead of being recreated.
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(_LABEL_NODES_MAX_WORKERS, len(names)),
+            thread_name_prefix='elb-label-nodes',
+        ) as pool:
+            futures = [pool.submit(self._kubectl_run, 'label', 'nodes', name,
+                                   f'ordinal={i}', '--overwrite')
+                       for i, name in enumerate(names)]
+            for fut in concurrent.futures.as_completed(futures):
+                fut.result()
 
 
 # ---------------------------------------------------------------------------
@@ -1823,12 +2035,55 @@ def get_snapshots(cfg: ElasticBlastConfig, dry_run: bool = False) -> List[str]:
     return _sdk_get_snapshots(cfg.azure.resourcegroup, dry_run)
 
 
+# Short-lived cache for list_disks_and_snapshots(), keyed by
+# (resource group, dry_run). Cleanup asks for both listings back-to-back;
+# the TTL only needs to cover one cleanup pass.
+_DISK_LISTING_TTL_S = 30.0
+_disk_listing_cache: Dict[Tuple[str, bool], Tuple[float, List[str], List[str]]] = {}
+_disk_listing_lock = threading.Lock()
+
+
+def list_disks_and_snapshots(cfg: ElasticBlastConfig,
+                             dry_run: bool = False) -> Tuple[List[str], List[str]]:
+    """Return (disks, snapshots) in the resource group.
+
+    The two listings are independent ARM calls and are issued concurrently.
+    Results are cached for ``_DISK_LISTING_TTL_S`` seconds; delete_disk()
+    and delete_snapshot() invalidate the cache for their resource group.
+    """
+    key = (cfg.azure.resourcegroup, dry_run)
+    with _disk_listing_lock:
+        hit = _disk_listing_cache.get(key)
+    if hit and time.monotonic() - hit[0] < _DISK_LISTING_TTL_S:
+        return list(hit[1]), list(hit[2])
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=2,
+        thread_name_prefix='elb-disk-list',
+    ) as pool:
+        disks_fut = pool.submit(get_disks, cfg, dry_run)
+        snaps_fut = pool.submit(get_snapshots, cfg, dry_run)
+        disks, snapshots = disks_fut.result(), snaps_fut.result()
+    with _disk_listing_lock:
+        _disk_listing_cache[key] = (time.monotonic(), list(disks), list(snapshots))
+    return disks, snapshots
+
+
+def _invalidate_disk_listing(resource_group: str) -> None:
+    """Drop cached disk/snapshot listings for a resource group."""
+    with _disk_listing_lock:
+        for key in [k for k in _disk_listing_cache if k[0] == resource_group]:
+            del _disk_listing_cache[key]
+
+
 def delete_disk(name: str, cfg: ElasticBlastConfig) -> None:
     if not name:
         raise ValueError('No disk name provided')
     if not cfg:
         raise ValueError('No application config provided')
-    _sdk_delete_disk(cfg.azure.resourcegroup, name)
+    try:
+        _sdk_delete_disk(cfg.azure.resourcegroup, name)
+    finally:
+        _invalidate_disk_listing(cfg.azure.resourcegroup)
 
 
 def delete_snapshot(name: str, cfg: ElasticBlastConfig) -> None:
@@ -1836,7 +2091,10 @@ def delete_snapshot(name: str, cfg: ElasticBlastConfig) -> None:
         raise ValueError('No snapshot name provided')
     if not cfg:
         raise ValueError('No application config provided')
-    _sdk_delete_snapshot(cfg.azure.resourcegroup, name)
+    try:
+        _sdk_delete_snapshot(cfg.azure.resourcegroup, name)
+    finally:
+        _invalidate_disk_listing(cfg.azure.resourcegroup)
 
 
 def get_aks_clusters(cfg: ElasticBlastConfig) -> List[str]:
@@ -1848,6 +2106,71 @@ def get_aks_credentials(cfg: ElasticBlastConfig) -> str:
                                    cfg.cluster.dry_run)
 
 
+# Resolved kubectl contexts are cached on disk for a short while so that
+# back-to-back CLI invocations (e.g. repeated ``elastic-blast status``) do
+# not each pay an ARM credentials round-trip plus a kubeconfig merge.
+_AKS_CTX_CACHE_DIR = '~/.elastic-blast'
+_AKS_CTX_CACHE_TTL_S = 300
+# kubectl stderr fragments that mean the cached context is no longer usable.
+_KUBECTL_AUTH_ERRORS = (
+    'Unauthorized',
+    'error: context ',
+    'no such host',                # API server DNS name of a deleted cluster
+    'x509: ',                      # certificate of a recreated cluster
+)
+
+
+def _aks_ctx_cache_path(cfg: ElasticBlastConfig) -> str:
+    """Return the cache file for this cluster; the identity is hashed so
+    account, resource group and cluster names never appear in file names."""
+    identity = f'{cfg.azure.user}\0{cfg.azure.resourcegroup}\0{cfg.cluster.name}'
+    digest = hashlib.sha256(identity.encode()).hexdigest()
+    return os.path.join(os.path.expanduser(_AKS_CTX_CACHE_DIR), f'aks-ctx-{digest}.json')
+
+
+def _load_cached_k8s_ctx(cfg: ElasticBlastConfig) -> Optional[str]:
+    """Return a cached, unexpired kubectl context or None."""
+    try:
+        with open(_aks_ctx_cache_path(cfg)) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('expires_at', 0) <= time.time():
+        return None
+    ctx = data.get('ctx')
+    return ctx if isinstance(ctx, str) and ctx else None
+
+
+def _save_cached_k8s_ctx(cfg: ElasticBlastConfig, ctx: str) -> None:
+    """Persist a kubectl context with a TTL. Failures are non-fatal."""
+    path = _aks_ctx_cache_path(cfg)
+    tmp_path: Optional[str] = None
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False,
+                                         dir=os.path.dirname(path)) as tmp:
+            tmp_path = tmp.name
+            json.dump({'ctx': ctx, 'expires_at': time.time() + _AKS_CTX_CACHE_TTL_S}, tmp)
+        os.replace(tmp_path, path)
+        tmp_path = None
+    except OSError as e:
+        logging.debug(f'Could not cache kubectl context: {e}')
+    finally:
+        if tmp_path:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def _drop_cached_k8s_ctx(cfg: ElasticBlastConfig) -> None:
+    """Forget the cached kubectl context, e.g. after an auth failure."""
+    try:
+        os.unlink(_aks_ctx_cache_path(cfg))
+    except OSError:
+        pass
+
+
 def set_role_assignment(cfg: ElasticBlastConfig):
     _sdk_set_role_assignments(cfg.azure.resourcegroup, cfg.cluster.name,
                              cfg.azure.storage_account,
@@ -1855,9 +2178,33 @@ def set_role_assignment(cfg: ElasticBlastConfig):
                              cfg.cluster.dry_run)
 
 
+# Very short-lived cache for check_cluster(), keyed by (resource group,
+# cluster name, dry_run). Status reporting, cleanup and polling loops often
+# ask for the same state within moments of each other; this collapses those
+# bursts into one ARM call without noticeably delaying state changes.
+_CLUSTER_STATE_TTL_S = 2.0
+_cluster_state_cache: Dict[Tuple[str, str, bool], Tuple[float, str]] = {}
+_cluster_state_lock = threading.Lock()
+
+
 def check_cluster(cfg: ElasticBlastConfig) -> str:
-    return _sdk_check_cluster(cfg.azure.resourcegroup, cfg.cluster.name,
-                             cfg.cluster.dry_run)
+    key = (cfg.azure.resourcegroup, cfg.cluster.name, cfg.cluster.dry_run)
+    with _cluster_state_lock:
+        hit = _cluster_state_cache.get(key)
+    if hit and time.monotonic() - hit[0] < _CLUSTER_STATE_TTL_S:
+        return hit[1]
+    status = _sdk_check_cluster(*key)
+    with _cluster_state_lock:
+        _cluster_state_cache[key] = (time.monotonic(), status)
+    return status
+
+
+def _invalidate_cluster_state(resource_group: str, cluster_name: str) -> None:
+    """Drop cached check_cluster() results for a cluster."""
+    with _cluster_state_lock:
+        for key in [k for k in _cluster_state_cache
+                    if k[:2] == (resource_group, cluster_name)]:
+            del _cluster_state_cache[key]
 
 
 def start_cluster(cfg: ElasticBlastConfig) -> str:
@@ -1881,6 +2228,9 @@ def start_cluster_async(cfg: ElasticBlastConfig):
             k, _, v = pair.partition('=')
             tags[k.strip()] = v.strip()
 
+    _invalidate_cluster_state(cfg.azure.resourcegroup, name)
+    if not cfg.cluster.dry_run:
+        _drop_cached_k8s_ctx(cfg)
     return _sdk_start_cluster(
         resource_group=cfg.azure.resourcegroup, cluster_name=name,
         location=cfg.azure.region, machine_type=cfg.cluster.machine_type,
@@ -1916,9 +2266,13 @@ def delete_cluster(cfg: ElasticBlastConfig) -> str:
     """Delete AKS cluster. Blocks until deletion completes."""
     name = cfg.cluster.name
     start = timer()
+    _invalidate_cluster_state(cfg.azure.resourcegroup, name)
+    if not cfg.cluster.dry_run:
+        _drop_cached_k8s_ctx(cfg)
     poller = _sdk_delete_cluster(cfg.azure.resourcegroup, name, cfg.cluster.dry_run)
     if poller:
         poller.result()
+    _invalidate_cluster_state(cfg.azure.resourcegroup, name)
     elapsed = timer() - start
     logging.debug(f'RUNTIME cluster-delete {elapsed:.1f}s')
     track_cluster_deleted(cluster_name=name, duration_s=elapsed,
@@ -1935,20 +2289,34 @@ def check_prerequisites() -> None:
 # Resource cleanup
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=32)
+def _load_resource_ids(results: str, job_id: str) -> ResourceIds:
+    """Read the disk/snapshot ID metadata blob for one submission.
+
+    Memoized per process: status and cleanup paths ask for the same IDs
+    repeatedly. Only non-empty results are cached (an empty file raises
+    so that a later write is picked up); call ``cache_clear()`` after
+    the metadata is rewritten.
+    """
+    path = os.path.join(results, job_id, ELB_METADATA_DIR, ELB_STATE_DISK_ID_FILE)
+    with open_for_read(path) as f:
+        retval = ResourceIds.from_json(f.read())
+    if not retval.disks and not retval.snapshots:
+        raise LookupError(f'No resource IDs recorded in {path}')
+    return retval
+
+
 @retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
 def _get_resource_ids(cfg: ElasticBlastConfig) -> ResourceIds:
     """Fetch persistent disk/snapshot IDs from Blob Storage metadata."""
     if cfg.appstate.resources.disks and cfg.appstate.resources.snapshots:
         return cfg.appstate.resources
-    path = os.path.join(cfg.cluster.results, cfg.azure.elb_job_id,
-                        ELB_METADATA_DIR, ELB_STATE_DISK_ID_FILE)
     try:
-        with open_for_read(path) as f:
-            retval = ResourceIds.from_json(f.read())
-        if retval.disks or retval.snapshots:
-            return retval
+        cached = _load_resource_ids(cfg.cluster.results, cfg.azure.elb_job_id)
+        # Hand out copies: the cached instance is shared by all callers.
+        return ResourceIds(disks=list(cached.disks), snapshots=list(cached.snapshots))
     except Exception as e:
-        logging.debug(f'Unable to read {path}: {e}')
+        logging.debug(f'Unable to read resource IDs for {cfg.azure.elb_job_id}: {e}')
     return ResourceIds()
 
 
@@ -2097,15 +2465,49 @@ def _abort_if_other_submissions_active(cfg: ElasticBlastConfig) -> None:
             f'ELB_FORCE_DELETE=1 to override (this will destroy their data).')
 
 
+# Back-off bounds (seconds) for polling a Starting/Updating AKS cluster in
+# _wait_for_cluster_ready.
+_CLUSTER_READY_POLL_MIN_S = 1.0
+_CLUSTER_READY_POLL_MAX_S = 30.0
+
+
+class _ClusterWait(Enum):
+    """What _wait_for_cluster_ready does for an AKS provisioning state."""
+    USABLE = 'usable'      # stop waiting; Kubernetes can be used
+    UNUSABLE = 'unusable'  # stop waiting; Kubernetes will not become usable
+    WAIT = 'wait'          # poll again after a back-off
+
+
+# Provisioning state -> action in _wait_for_cluster_ready. Other states are
+# logged as unrecognized and treated as usable.
+_AKS_WAIT_ACTIONS: Mapping[str, _ClusterWait] = MappingProxyType({
+    AKS_PROVISIONING_STATE.SUCCEEDED.value: _ClusterWait.USABLE,
+    AKS_PROVISIONING_STATE.FAILED.value: _ClusterWait.UNUSABLE,
+    AKS_PROVISIONING_STATE.STOPPING.value: _ClusterWait.UNUSABLE,
+    AKS_PROVISIONING_STATE.DELETING.value: _ClusterWait.UNUSABLE,
+    AKS_PROVISIONING_STATE.STARTING.value: _ClusterWait.WAIT,
+    AKS_PROVISIONING_STATE.UPDATING.value: _ClusterWait.WAIT,
+})
+
+
 def _wait_for_cluster_ready(cfg: ElasticBlastConfig, allow_missing: bool = False) -> bool:
     """Wait for AKS cluster to reach a terminal state. Returns True if K8s is usable.
 
     Args:
         allow_missing: If True, return False instead of raising when cluster not found.
                        Used by cleanup stack where throwing would hide the original error.
+
+    Transitional states are polled with a back-off that starts at
+    ``_CLUSTER_READY_POLL_MIN_S`` and restarts whenever the state changes,
+    so quick transitions are seen promptly and long ones are polled rarely.
     """
+    poll_s = _CLUSTER_READY_POLL_MIN_S
+    last_status = None
     while True:
         status = check_cluster(cfg)
+        if status != last_status:
+            poll_s = _CLUSTER_READY_POLL_MIN_S
+            last_status = status
         if not status:
             if cfg.cluster.dry_run:
                 return False
@@ -2120,42 +2522,58 @@ def _wait_for_cluster_ready(cfg: ElasticBlastConfig, allow_missing: bool = False
             remove_split_query(cfg)
             return False
 
-        if status == AKS_PROVISIONING_STATE.SUCCEEDED.value:
-            return True
-        if status in (AKS_PROVISIONING_STATE.FAILED.value,
-                      AKS_PROVISIONING_STATE.STOPPING.value,
-                      AKS_PROVISIONING_STATE.DELETING.value):
-            return False
-        if status in (AKS_PROVISIONING_STATE.STARTING.value,
-                      AKS_PROVISIONING_STATE.UPDATING.value):
-            time.sleep(10)
+        action = _AKS_WAIT_ACTIONS.get(status)
+        if action is _ClusterWait.WAIT:
+            time.sleep(poll_s)
+            poll_s = min(poll_s * 1.5, _CLUSTER_READY_POLL_MAX_S)
             continue
-
-        logging.warning(f'Unrecognized cluster status: {status}')
-        return True
+        if action is None:
+            logging.warning(f'Unrecognized cluster status: {status}')
+        return action is not _ClusterWait.UNUSABLE
 
 
 def _cleanup_k8s_resources(cfg, pds, snapshots, dry_run):
-    """Delete K8s objects and collect resource IDs."""
-    try:
-        cfg.appstate.k8s_ctx = get_aks_credentials(cfg)
-        kubernetes.check_server(cfg.appstate.k8s_ctx, dry_run)
-    except Exception as e:
-        logging.warning(f'K8s connection failed: {e}')
-        return pds, snapshots
+    """Delete K8s objects and collect resource IDs.
+
+    A kubectl context already known to this process, or cached on disk by
+    ElasticBlastAzure._get_k8s_ctx, is reused when the API server accepts
+    it; credentials are fetched from ARM only otherwise.
+    """
+    ctx = cfg.appstate.k8s_ctx or (None if dry_run else _load_cached_k8s_ctx(cfg))
+    if ctx:
+        try:
+            kubernetes.check_server(ctx, dry_run)
+            cfg.appstate.k8s_ctx = ctx
+        except Exception as e:
+            logging.debug(f'Cached kubectl context {ctx} unusable: {e}')
+            _drop_cached_k8s_ctx(cfg)
+            ctx = None
+    if not ctx:
+        try:
+            cfg.appstate.k8s_ctx = get_aks_credentials(cfg)
+            kubernetes.check_server(cfg.appstate.k8s_ctx, dry_run)
+        except Exception as e:
+            logging.warning(f'K8s connection failed: {e}')
+            return pds, snapshots
 
     ctx = cfg.appstate.k8s_ctx
     assert ctx
 
-    try:
-        pds = kubernetes.get_persistent_disks(ctx, dry_run)
-    except Exception as e:
-        logging.warning(f'get_persistent_disks failed: {e}')
-
-    try:
-        snapshots = kubernetes.get_volume_snapshots(ctx, dry_run)
-    except Exception as e:
-        logging.warning(f'get_volume_snapshots failed: {e}')
+    # Independent reads of two API endpoints: issue them together.
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=2,
+        thread_name_prefix='elb-k8s-storage',
+    ) as pool:
+        pds_fut = pool.submit(kubernetes.get_persistent_disks, ctx, dry_run)
+        snaps_fut = pool.submit(kubernetes.get_volume_snapshots, ctx, dry_run)
+        try:
+            pds = pds_fut.result()
+        except Exception as e:
+            logging.warning(f'get_persistent_disks failed: {e}')
+        try:
+            snapshots = snaps_fut.result()
+        except Exception as e:
+            logging.warning(f'get_volume_snapshots failed: {e}')
 
     try:
         kubernetes.delete_all(ctx, dry_run)
@@ -2180,34 +2598,68 @@ def _is_safe_azure_resource_name(name: str) -> bool:
     return bool(_AZURE_RES_NAME_RE.match(str(name or '')))
 
 
+# Upper bound on concurrent disk/snapshot deletions in _cleanup_leaked_disks.
+_LEAK_CLEANUP_MAX_WORKERS = 16
+
+
 def _cleanup_leaked_disks(cfg, pds, snapshots, dry_run):
-    """Delete any disks/snapshots that survived K8s cleanup."""
+    """Delete any disks/snapshots that survived K8s cleanup.
+
+    Deletions are independent ARM long-running operations and are issued
+    concurrently; a failure is reported for that resource only.
+    """
     rg = cfg.azure.resourcegroup
-    for disk in pds:
-        if not _is_safe_azure_resource_name(disk):
-            logging.error(f'Refusing to clean up suspicious disk name: {disk!r}')
-            continue
-        try:
-            if disk in get_disks(cfg, dry_run):
-                delete_disk(disk, cfg)
-        except Exception as e:
-            logging.error(f'Failed to delete disk {disk}: {e}')
-            _warn_leaked_resource('disk', disk, rg,
-                f"az disk list --resource-group {rg} --query \"[?name=='{disk}']\" -o table",
-                f'az disk delete -y --name {disk} --resource-group {rg}')
-
-    for snap in snapshots:
-        if not _is_safe_azure_resource_name(snap):
-            logging.error(f'Refusing to clean up suspicious snapshot name: {snap!r}')
-            continue
-        try:
-            if snap in get_snapshots(cfg, dry_run):
-                delete_snapshot(snap, cfg)
-        except Exception as e:
-            logging.error(f'Failed to delete snapshot {snap}: {e}')
-            _warn_leaked_resource('snapshot', snap, rg,
-                f"az snapshot list --resource-group {rg} --query \"[?name=='{snap}']\" -o table",
-                f'az snapshot delete --name {snap} --resource-group {rg}')
+    if not pds and not snapshots:
+        return
+    listing_error: Optional[Exception] = None
+    all_disks: Set[str] = set()
+    all_snapshots: Set[str] = set()
+    try:
+        disks, snaps = list_disks_and_snapshots(cfg, dry_run)
+        all_disks, all_snapshots = set(disks), set(snaps)
+    except Exception as e:
+        # Reported per resource below, with the manual cleanup commands.
+        listing_error = e
+
+    def warn_disk(disk):
+        _warn_leaked_resource('disk', disk, rg,
+            f"az disk list --resource-group {rg} --query \"[?name=='{disk}']\" -o table",
+            f'az disk delete -y --name {disk} --resource-group {rg}')
+
+    def warn_snapshot(snap):
+        _warn_leaked_resource('snapshot', snap, rg,
+            f"az snapshot list --resource-group {rg} --query \"[?name=='{snap}']\" -o table",
+            f'az snapshot delete --name {snap} --resource-group {rg}')
+
+    # (kind, name, delete function, leak warning) for each resource to delete
+    work = []
+    for kind, names, existing, deleter, warn in (
+            ('disk', pds, all_disks, delete_disk, warn_disk),
+            ('snapshot', snapshots, all_snapshots, delete_snapshot, warn_snapshot)):
+        for name in names:
+            if not _is_safe_azure_resource_name(name):
+                logging.error(f'Refusing to clean up suspicious {kind} name: {name!r}')
+                continue
+            if listing_error:
+                logging.error(f'Failed to delete {kind} {name}: {listing_error}')
+                warn(name)
+            elif name in existing:
+                work.append((kind, name, deleter, warn))
+    if not work:
+        return
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(_LEAK_CLEANUP_MAX_WORKERS, len(work)),
+        thread_name_prefix='elb-leak-cleanup',
+    ) as pool:
+        futures = [(pool.submit(deleter, name, cfg), kind, name, warn)
+                   for kind, name, deleter, warn in work]
+        for fut, kind, name, warn in futures:
+            try:
+                fut.result()
+            except Exception as e:
+                logging.error(f'Failed to delete {kind} {name}: {e}')
+                warn(name)
 
 
 def _warn_leaked_resource(kind: str, name: str, rg: str, check_cmd: str, delete_cmd: str):
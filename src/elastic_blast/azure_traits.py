@@ -10,6 +10,7 @@ Author: Victor Joukov joukovv@ncbi.nlm.nih.gov
 import logging
 import math
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 from .base import InstanceProperties
 from .util import UserReportError, safe_exec
@@ -72,6 +73,7 @@ def get_sas_token(storage_account: str, storage_account_container: str, storage_
     return ''
 
 
+@lru_cache(maxsize=16)
 def get_blob_service_client(storage_account: str) -> BlobServiceClient:
     """Create Azure Blob Service Client using DefaultAzureCredential (Managed Identity).
     
@@ -79,6 +81,12 @@ def get_blob_service_client(storage_account: str) -> BlobServiceClient:
     - Managed Identity (in AKS pods)
     - Azure CLI credentials (local development)
     - Environment variables (service principal)
+
+    Clients are cached per storage account for the life of the process.
+    A fresh credential per call re-ran the identity chain (for Azure CLI
+    credentials, an ``az`` subprocess) and fetched a new AAD token every
+    time; a reused credential caches its token and refreshes it before
+    expiry on its own.
     """
     account_url = f"https://{storage_account}.blob.core.windows.net"
     credential = DefaultAzureCredential()
@@ -84,6 +84,21 @@ class ElbExecutionMode(Enum):
 # jobs
 ELB_PAUSE_AFTER_INIT_PV = 150
 
+# Maximum number of concurrent kubectl patch calls used to clear PV/PVC
+# finalizers when deleting all kubernetes objects
+ELB_K8S_PATCH_MAX_WORKERS = 8
+
+# Timeout in seconds for the version checks of command line tools run by
+# check_prerequisites; a hung credential helper fails fast instead of blocking
+ELB_DEPENDENCY_CHECK_TIMEOUT = 20
+
+# Below this many BLAST job files, starting render worker processes costs
+# more than the template substitution work they would spread across CPUs
+ELB_JOB_RENDER_POOL_MIN_JOBS = 512
+
+# Number of job files handed to a render worker process at a time
+ELB_JOB_RENDER_POOL_CHUNK = 64
+
 # How much RAM is recommended relative to the BLASTDB size
 ELB_BLASTDB_MEMORY_MARGIN = 1.1
 
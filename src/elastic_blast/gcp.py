@@ -25,6 +25,7 @@ Authors: Greg Boratyn boratyng@ncbi.nlm.nih.gov
          Yuriy Merezhuk merezhuk@ncbi.nlm.nih.gov
 """
 
+import concurrent.futures
 import os
 from pathlib import Path
 from subprocess import check_call
@@ -34,7 +35,7 @@ import logging
 import json
 import shutil
 from timeit import default_timer as timer
-from typing import Any, DefaultDict, Dict, Optional, List, Tuple
+from typing import Any, DefaultDict, Dict, Optional, List, Set, Tuple
 import uuid
 from collections import defaultdict
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -51,7 +52,7 @@ from .util import is_newer_version
 
 from . import kubernetes
 from .constants import CLUSTER_ERROR, ELB_NUM_JOBS_SUBMITTED, ELB_METADATA_DIR, K8S_JOB_SUBMIT_JOBS
-from .constants import ELB_STATE_DISK_ID_FILE, DEPENDENCY_ERROR
+from .constants import ELB_STATE_DISK_ID_FILE, DEPENDENCY_ERROR, ELB_DEPENDENCY_CHECK_TIMEOUT
 from .constants import ELB_QUERY_BATCH_DIR, ELB_DFLT_MIN_NUM_NODES
 from .constants import K8S_JOB_CLOUD_SPLIT_SSD, K8S_JOB_INIT_PV
 from .constants import K8S_JOB_BLAST, K8S_JOB_GET_BLASTDB, K8S_JOB_IMPORT_QUERY_BATCHES
@@ -483,7 +484,7 @@ class ElasticBlastGcp(ElasticBlast):
             # so it can be unsuccessful for some users
             p = safe_exec(cmd)
             if p.stdout:
-                res = json.loads(p.stdout.decode())
+                res = json.loads(p.stdout)
                 if 'quotas' in res:
                     for quota in res['quotas']:
                         if quota['metric'] == 'SSD_TOTAL_GB':
@@ -517,14 +518,14 @@ def get_disks(cfg: ElasticBlastConfig, dry_run: bool = False) -> list[str]:
     Raises:
         util.SafeExecError on problems with command line gcloud,
         RuntimeError when gcloud results cannot be parsed"""
-    cmd = f'gcloud compute disks list --format json --project {cfg.gcp.project}'
+    cmd = f'gcloud compute disks list --format json(name) --project {cfg.gcp.project}'
     if dry_run:
         logging.info(cmd)
         return list()
 
     p = safe_exec(cmd)
     try:
-        disks = json.loads(p.stdout.decode())
+        disks = json.loads(p.stdout)
     except Exception as err:
         raise RuntimeError('Error when parsing listing of GCP disks' + str(err))
     if disks is None:
@@ -537,14 +538,14 @@ def get_snapshots(cfg: ElasticBlastConfig, dry_run: bool = False) -> list[str]:
     Raises:
         util.SafeExecError on problems with command line gcloud,
         RuntimeError when gcloud results cannot be parsed"""
-    cmd = f'gcloud compute snapshots list --format json --project {cfg.gcp.project}'
+    cmd = f'gcloud compute snapshots list --format json(name) --project {cfg.gcp.project}'
     if dry_run:
         logging.info(cmd)
         return list()
 
     p = safe_exec(cmd)
     try:
-        snapshots = json.loads(p.stdout.decode())
+        snapshots = json.loads(p.stdout)
     except Exception as err:
         raise RuntimeError('Error when parsing listing of GCP snapshots' + str(err))
     if snapshots is None:
@@ -552,6 +553,17 @@ def get_snapshots(cfg: ElasticBlastConfig, dry_run: bool = False) -> list[str]:
     return [i['name'] for i in snapshots]
 
 
+def _list_disks_and_snapshots(cfg: ElasticBlastConfig, dry_run: bool = False) -> Tuple[Set[str], Set[str]]:
+    """Return sets of disk and volume snapshot names in the current GCP
+    project. The two gcloud listings are run concurrently.
+    Raises:
+        Exceptions raised by get_disks and get_snapshots"""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        disks = pool.submit(get_disks, cfg, dry_run)
+        snapshots = pool.submit(get_snapshots, cfg, dry_run)
+        return set(disks.result()), set(snapshots.result())
+
+
 def delete_disk(name: str, cfg: ElasticBlastConfig) -> None:
     """Delete a persistent disk.
 
@@ -588,6 +600,11 @@ def delete_snapshot(name: str, cfg: ElasticBlastConfig) -> None:
     safe_exec(cmd)
 
 
+# Errors reported by gsutil for a GCS object that does not exist or cannot
+# be read by the current account
+_GSUTIL_NOT_READABLE = ('No URLs matched', 'AccessDeniedException')
+
+
 @retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10)) # type: ignore
 def _get_resource_ids(cfg: ElasticBlastConfig) -> ResourceIds:
     """ Try to get the GCP persistent disk ID from elastic-blast records"""
@@ -600,16 +617,21 @@ def _get_resource_ids(cfg: ElasticBlastConfig) -> ResourceIds:
         return retval
 
     disk_id_on_gcs = os.path.join(cfg.cluster.results, ELB_METADATA_DIR, ELB_STATE_DISK_ID_FILE)
-    cmd = f'gsutil -q stat {disk_id_on_gcs}'
-    try:
-        safe_exec(cmd)
-    except Exception as e:
-        logging.debug(f'{disk_id_on_gcs} not found')
-        return retval
-
+    # A missing object is reported by cat itself, so no separate
+    # 'gsutil stat' (another interpreter start-up) is needed
     cmd = f'gsutil -q cat {disk_id_on_gcs}'
     try:
         p = safe_exec(cmd)
+    except SafeExecError as e:
+        # A missing or unreadable object means there are no recorded
+        # resources; only other (e.g. transient) failures are retried
+        if any(marker in e.message for marker in _GSUTIL_NOT_READABLE):
+            logging.debug(f'{disk_id_on_gcs} not found')
+            return retval
+        logging.debug(f'Unable to read {disk_id_on_gcs}: {e}')
+        raise
+
+    try:
         retval = ResourceIds.from_json(p.stdout.decode())
 
         err = p.stderr.decode()
@@ -711,36 +733,25 @@ def delete_cluster_with_cleanup(cfg: ElasticBlastConfig) -> None:
         # using the API directly of missing pre-conditions
         assert(k8s_ctx)
 
-        try:
-            # get cluster's persistent disk in case they leak
-            pds = kubernetes.get_persistent_disks(k8s_ctx, dry_run)
-        except Exception as e:
-            logging.warning(f'kubernetes.get_persistent_disks failed.\tDetails: {e}')
-
-        try:
-            # get cluster's volume snapshots in case they leak
-            snapshots = kubernetes.get_volume_snapshots(k8s_ctx, dry_run)
-        except Exception as e:
-            logging.warning(f'kubernetes.get_volume_snapshots failed.\tDetails: {e}')
+        # get cluster's persistent disks and volume snapshots in case they
+        # leak; the two queries are independent and run concurrently
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+            pds_future = pool.submit(kubernetes.get_persistent_disks, k8s_ctx, dry_run)
+            snapshots_future = pool.submit(kubernetes.get_volume_snapshots, k8s_ctx, dry_run)
+            try:
+                pds = pds_future.result()
+            except Exception as e:
+                logging.warning(f'kubernetes.get_persistent_disks failed.\tDetails: {e}')
+            try:
+                snapshots = snapshots_future.result()
+            except Exception as e:
+                logging.warning(f'kubernetes.get_volume_snapshots failed.\tDetails: {e}')
 
         try:
             # delete all k8s jobs, persistent volumes and volume claims
             # this should delete persistent disks
             deleted = kubernetes.delete_all(k8s_ctx, dry_run)
             logging.debug(f'Deleted k8s objects {" ".join(deleted)}')
-            disks = get_disks(cfg, dry_run)
-            for i in pds:
-                if i in disks:
-                    logging.debug(f'PD {i} still present after deleting k8s jobs and PVCs')
-                else:
-                    logging.debug(f'PD {i} was deleted by deleting k8s PVC')
-
-            all_snapshots = get_snapshots(cfg, dry_run)
-            for i in snapshots:
-                if i in all_snapshots:
-                    logging.debug(f'Snapshot {i} still present after deleting k8s jobs and volume snapshots')
-                else:
-                    logging.debug(f'Snapshot {i} was deleted by deleting k8s volume snapshots')
         except Exception as e:
             # nothing to do the above fails, the code below will take care of
             # persistent disk leak
@@ -749,13 +760,13 @@ def delete_cluster_with_cleanup(cfg: ElasticBlastConfig) -> None:
     if pds:
         try:
             # delete persistent disks if they are still in GCP, this may be faster
-            # than deleting a non-existent disk
-            disks = get_disks(cfg, dry_run)
+            # than deleting a non-existent disk; disks deleted together with
+            # their k8s PVCs are simply absent from the listing
+            disks, all_snapshots = _list_disks_and_snapshots(cfg, dry_run)
             for i in pds:
                 if i in disks:
                     logging.debug(f'PD {i} still present after cluster deletion, deleting again')
                     delete_disk(i, cfg)
-            all_snapshots = get_snapshots(cfg, dry_run)
             for i in snapshots:
                 if i in all_snapshots:
                     logging.debug(f'Snapshot {i} still present after cluster deletion, deleting again')
@@ -775,7 +786,7 @@ def delete_cluster_with_cleanup(cfg: ElasticBlastConfig) -> None:
                 except Exception as e:
                     logging.error(getattr(e, 'message', repr(e)))
         finally:
-            disks = get_disks(cfg, dry_run)
+            disks, all_snapshots = _list_disks_and_snapshots(cfg, dry_run)
             for i in pds:
                 if i in disks:
                     msg = f'ElasticBLAST was not able to delete persistent disk "{i}". ' \
@@ -785,7 +796,6 @@ def delete_cluster_with_cleanup(cfg: ElasticBlastConfig) -> None:
                         f'and delete it with:\ngcloud compute disks delete {i} --project {cfg.gcp.project} --zone {cfg.gcp.zone}'
                     logging.error(msg)
 
-            all_snapshots = get_snapshots(cfg, dry_run)
             for i in snapshots:
                 if i in all_snapshots:
                     msg = f'ElasticBLAST was not able to delete volume snapshot "{i}". ' \
@@ -803,6 +813,8 @@ def delete_cluster_with_cleanup(cfg: ElasticBlastConfig) -> None:
 
 def get_gke_clusters(cfg: ElasticBlastConfig) -> list[str]:
     """Return a list of GKE cluster names.
+    The listing is projected to names only, so its size does not grow with
+    the full cluster descriptions.
 
     Arguments:
         cfg: configuration object
@@ -810,10 +822,10 @@ def get_gke_clusters(cfg: ElasticBlastConfig) -> list[str]:
     Raises:
         util.SafeExecError on problems with command line gcloud
         RuntimeError on problems parsing gcloud JSON output"""
-    cmd = f'gcloud container clusters list --format json --project {cfg.gcp.project}'
+    cmd = f'gcloud container clusters list --format json(name) --project {cfg.gcp.project}'
     p = safe_exec(cmd)
     try:
-        clusters = json.loads(p.stdout.decode())
+        clusters = json.loads(p.stdout)
     except Exception as err:
         raise RuntimeError(f'Error when parsing JSON listing of GKE clusters: {str(err)}')
     return [i['name'] for i in clusters]
@@ -830,18 +842,15 @@ def get_gke_credentials(cfg: ElasticBlastConfig) -> str:
 
     Raises:
         util.SafeExecError on problems with command line gcloud"""
-    cmd: list[str] = 'gcloud container clusters get-credentials'.split()
-    cmd.append(cfg.cluster.name)
-    cmd.append('--project')
-    cmd.append(f'{cfg.gcp.project}')
-    cmd.append('--zone')
-    cmd.append(f'{cfg.gcp.zone}')
+    cmd = ['gcloud', 'container', 'clusters', 'get-credentials', cfg.cluster.name,
+           '--project', f'{cfg.gcp.project}',
+           '--zone', f'{cfg.gcp.zone}']
     if cfg.cluster.dry_run:
         logging.info(cmd)
     else:
         safe_exec(cmd)
 
-    cmd = 'kubectl config current-context'.split()
+    cmd = ['kubectl', 'config', 'current-context']
     retval = K8S_UNINITIALIZED_CONTEXT
     if cfg.cluster.dry_run:
         logging.info(cmd)
@@ -906,59 +915,35 @@ def start_cluster(cfg: ElasticBlastConfig):
     use_local_ssd = cfg.cluster.use_local_ssd
     dry_run = cfg.cluster.dry_run
 
-    actual_params = ["gcloud", "container", "clusters", "create", cluster_name]
-    actual_params.append('--no-enable-autoupgrade')
-    #actual_params.append('--no-enable-ip-alias')
-    actual_params.append('--project')
-    actual_params.append(f'{cfg.gcp.project}')
-    actual_params.append('--zone')
-    actual_params.append(f'{cfg.gcp.zone}')
-
-    actual_params.append('--machine-type')
-    actual_params.append(machine_type)
-
-    actual_params.append('--num-nodes')
-    # Autoscaling for clusters with local SSD works only by shrinking
-    # so to support it we start cluster with maximum nodes.
-    # Thus the nodes are properly initialized and autoscaler
-    # later can remove them if/when they're not needed.
-    if use_local_ssd:
-        actual_params.append(str(cfg.cluster.num_nodes))
-    else:
-        actual_params.append(str(ELB_DFLT_MIN_NUM_NODES))
-
-    if use_preemptible:
-        actual_params.append('--preemptible')
-
-    # https://cloud.google.com/stackdriver/pricing
-    if cfg.cluster.enable_stackdriver:
-        actual_params.append('--enable-stackdriver-kubernetes')
-
     # ATT: hardcoded parameters
     # specifies GCP API in use
-    actual_params.append('--scopes')
     scopes = 'compute-rw,storage-rw,cloud-platform,logging-write,monitoring-write'
-    actual_params.append(scopes)
-
     # FIXME: labels, in future will be provided by config or run-time
     labels = cfg.cluster.labels
-    actual_params.append('--labels')
-    actual_params.append(labels)
 
-    if use_local_ssd:
-        actual_params.append('--local-ssd-count')
-        actual_params.append('1')
-
-    if cfg.gcp.network is not None:
-        actual_params.append(f'--network={cfg.gcp.network}')
-    if cfg.gcp.subnet is not None:
-        actual_params.append(f'--subnetwork={cfg.gcp.subnet}')
-
-    if cfg.gcp.gke_version:
-        actual_params.append('--cluster-version')
-        actual_params.append(f'{cfg.gcp.gke_version}')
-        actual_params.append('--node-version')
-        actual_params.append(f'{cfg.gcp.gke_version}')
+    actual_params = [
+        'gcloud', 'container', 'clusters', 'create', cluster_name,
+        '--no-enable-autoupgrade',
+        #'--no-enable-ip-alias',
+        '--project', f'{cfg.gcp.project}',
+        '--zone', f'{cfg.gcp.zone}',
+        '--machine-type', machine_type,
+        # Autoscaling for clusters with local SSD works only by shrinking
+        # so to support it we start cluster with maximum nodes.
+        # Thus the nodes are properly initialized and autoscaler
+        # later can remove them if/when they're not needed.
+        '--num-nodes', str(cfg.cluster.num_nodes) if use_local_ssd else str(ELB_DFLT_MIN_NUM_NODES),
+        *(['--preemptible'] if use_preemptible else []),
+        # https://cloud.google.com/stackdriver/pricing
+        *(['--enable-stackdriver-kubernetes'] if cfg.cluster.enable_stackdriver else []),
+        '--scopes', scopes,
+        '--labels', labels,
+        *(['--local-ssd-count', '1'] if use_local_ssd else []),
+        *([f'--network={cfg.gcp.network}'] if cfg.gcp.network is not None else []),
+        *([f'--subnetwork={cfg.gcp.subnet}'] if cfg.gcp.subnet is not None else []),
+        *(['--cluster-version', f'{cfg.gcp.gke_version}',
+           '--node-version', f'{cfg.gcp.gke_version}'] if cfg.gcp.gke_version else []),
+    ]
 
     start = timer()
     if dry_run:
@@ -973,12 +958,10 @@ def start_cluster(cfg: ElasticBlastConfig):
 
 def delete_cluster(cfg: ElasticBlastConfig):
     cluster_name = cfg.cluster.name
-    actual_params = ["gcloud", "container", "clusters", "delete", cluster_name]
-    actual_params.append('--project')
-    actual_params.append(f'{cfg.gcp.project}')
-    actual_params.append('--zone')
-    actual_params.append(f'{cfg.gcp.zone}')
-    actual_params.append('--quiet')
+    actual_params = ['gcloud', 'container', 'clusters', 'delete', cluster_name,
+                     '--project', f'{cfg.gcp.project}',
+                     '--zone', f'{cfg.gcp.zone}',
+                     '--quiet']
     start = timer()
     if cfg.cluster.dry_run:
         logging.info(actual_params)
@@ -995,7 +978,7 @@ def check_prerequisites() -> None:
     If execution of one of these tools is unsuccessful
     it will throw UserReportError exception."""
     try:
-        p = safe_exec('gcloud --version')
+        p = safe_exec('gcloud --version', timeout=ELB_DEPENDENCY_CHECK_TIMEOUT)
     except SafeExecError as e:
         message = f"Required pre-requisite 'gcloud' doesn't work, check installation of GCP SDK.\nDetails: {e.message}"
         raise UserReportError(DEPENDENCY_ERROR, message)
@@ -1003,7 +986,7 @@ def check_prerequisites() -> None:
 
     try:
         # client=true prevents kubectl from addressing server which can be down at the moment
-        p = safe_exec('kubectl version --output=json --client=true')
+        p = safe_exec('kubectl version --output=json --client=true', timeout=ELB_DEPENDENCY_CHECK_TIMEOUT)
     except SafeExecError as e:
         message = f"Required pre-requisite 'kubectl' doesn't work, check Kubernetes installation.\nDetails: {e.message}"
         raise UserReportError(DEPENDENCY_ERROR, message)
@@ -1023,7 +1006,7 @@ def check_prerequisites() -> None:
 
     # Check we have gsutil available
     try:
-        p = safe_exec('gsutil --version')
+        p = safe_exec('gsutil --version', timeout=ELB_DEPENDENCY_CHECK_TIMEOUT)
     except SafeExecError as e:
         message = f"Required pre-requisite 'gsutil' doesn't work, check installation of GCP SDK.\nDetails: {e.message}\nNote: this is because your query is located on GS, you may try another location"
         raise UserReportError(DEPENDENCY_ERROR, message)
@@ -1035,6 +1018,11 @@ def remove_split_query(cfg: ElasticBlastConfig) -> None:
     _remove_ancillary_data(cfg, ELB_QUERY_BATCH_DIR)
 
 
+# gsutil's default of 5 threads per process leaves a directory of many small
+# query batches bound by per-object DELETE round-trips
+_GSUTIL_PARALLEL_RM_OPTS = '-o GSUtil:parallel_thread_count=16'
+
+
 def _remove_ancillary_data(cfg: ElasticBlastConfig, bucket_prefix: str) -> None:
     """ Removes ancillary data from the end user's result bucket
     cfg: Configuration object
@@ -1042,7 +1030,7 @@ def _remove_ancillary_data(cfg: ElasticBlastConfig, bucket_prefix: str) -> None:
     """
     dry_run = cfg.cluster.dry_run
     out_path = os.path.join(cfg.cluster.results, bucket_prefix, '*')
-    cmd = f'gsutil -mq rm {out_path}'
+    cmd = f'gsutil {_GSUTIL_PARALLEL_RM_OPTS} -mq rm {out_path}'
     if dry_run:
         logging.info(cmd)
     else:
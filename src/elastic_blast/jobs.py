@@ -26,6 +26,8 @@ Generate Kubernetes job YAML files from template
 Author: Victor Joukov joukovv@ncbi.nlm.nih.gov
 """
 
+import logging
+import multiprocessing
 import os
 import re
 from typing import List
@@ -35,6 +37,7 @@ from typing import Optional
 from .filehelper import open_for_read, open_for_write
 from .subst import substitute_params
 from .constants import CSP, ELB_DFLT_BLAST_JOB_TEMPLATE, ELB_DFLT_BLAST_JOB_AKS_TEMPLATE, ELB_LOCAL_SSD_BLAST_JOB_TEMPLATE, ELB_LOCAL_SSD_BLAST_JOB_AKS_TEMPLATE
+from .constants import ELB_JOB_RENDER_POOL_MIN_JOBS, ELB_JOB_RENDER_POOL_CHUNK
 from .elb_config import ElasticBlastConfig
 
 def read_job_template(template_name=ELB_DFLT_BLAST_JOB_TEMPLATE, cfg: ElasticBlastConfig | None = None):
@@ -61,8 +64,14 @@ def read_job_template(template_name=ELB_DFLT_BLAST_JOB_TEMPLATE, cfg: ElasticBla
 re_batch_num = re.compile(r'[^0-9]+([0-9]{3,})')
 
 
-def _write_job_file(job_path, job_prefix, job_template, query_fqn, njob, **subs):
-    """ Write YAML job file from template making substitutions
+# Template and substitutions shared by all jobs rendered in a worker process,
+# set once by _init_render_worker instead of pickled with every task
+_worker_template = ''
+_worker_subs: dict = {}
+
+
+def _render_job_file(job_path, job_prefix, job_template, query_fqn, njob, **subs):
+    """ Render YAML job file text from template making substitutions
         internal function
     Parameters:
         job_path: path to which write job files
@@ -72,10 +81,8 @@ def _write_job_file(job_path, job_prefix, job_template, query_fqn, njob, **subs)
         njob: ordinal number of a job
         subs: other substitution variables
     Result:
-        Job file name
+        Tuple of job file name and job file contents
     """
-    if not job_template:
-        return None
     job_file_name = os.path.join(job_path, f'{job_prefix}{njob:03d}.yaml')
     query_path = os.path.dirname(query_fqn)
     query = os.path.splitext(os.path.basename(query_fqn))[0]
@@ -95,12 +102,46 @@ def _write_job_file(job_path, job_prefix, job_template, query_fqn, njob, **subs)
     map_obj['QUERY_NUM'] = query_num
     map_obj['JOB_NUM'] = query_num
 
-    s = substitute_params(job_template, map_obj)
+    return job_file_name, substitute_params(job_template, map_obj)
+
+
+def _write_job_file(job_path, job_prefix, job_template, query_fqn, njob, **subs):
+    """ Write YAML job file from template making substitutions
+        internal function
+    Parameters:
+        job_path: path to which write job files
+        job_prefix: name prefix for job file
+        job_template: string with contents of job file with variables to substitute
+        query_fqn: fully qualified name of query file
+        njob: ordinal number of a job
+        subs: other substitution variables
+    Result:
+        Job file name
+    """
+    if not job_template:
+        return None
+    job_file_name, s = _render_job_file(job_path, job_prefix, job_template,
+                                        query_fqn, njob, **subs)
     with open_for_write(job_file_name) as f:
         f.write(s)
     return job_file_name
 
 
+def _init_render_worker(job_template, subs):
+    """ Pool initializer: keep worker processes quiet and cache shared inputs """
+    global _worker_template, _worker_subs
+    logging.disable(logging.CRITICAL)
+    _worker_template = job_template
+    _worker_subs = subs
+
+
+def _render_in_worker(args):
+    """ Render one job file in a pool worker, args is (job_path, job_prefix, query, njob) """
+    job_path, job_prefix, query, njob = args
+    return _render_job_file(job_path, job_prefix, _worker_template, query, njob,
+                            BLAST_ELB_BATCH_NUM=str(njob), **_worker_subs)
+
+
 def write_job_files(job_path: str, job_prefix: str, job_template: str, queries: list[str], **subs):
     """ Write YAML job files from template making substitutions
     Parameters:
@@ -111,13 +152,32 @@ def write_job_files(job_path: str, job_prefix: str, job_template: str, queries:
         subs: other substitution variables
     Result:
         List of job file names
+
+    Large batches are rendered in a process pool; files are always written
+    by the calling process, so bucket paths are staged as with open_for_write.
+    Workers are spawned rather than forked, as the caller may be running
+    other threads (e.g. SDK or kubectl thread pools).
     """
     if not job_template:
         return []
+    ncpu = os.cpu_count() or 1
+    if len(queries) < ELB_JOB_RENDER_POOL_MIN_JOBS or ncpu < 2:
+        jobs = []
+        for njob, query in enumerate(queries):
+            subs['BLAST_ELB_BATCH_NUM'] = str(njob)
+            job = _write_job_file(job_path, job_prefix,
+                                  job_template, query, njob, **subs)
+            jobs.append(job)
+        return jobs
+
+    subs.pop('BLAST_ELB_BATCH_NUM', None)
+    tasks = [(job_path, job_prefix, query, njob) for njob, query in enumerate(queries)]
     jobs = []
-    for njob, query in enumerate(queries):
-        subs['BLAST_ELB_BATCH_NUM'] = str(njob)
-        job = _write_job_file(job_path, job_prefix,
-                              job_template, query, njob, **subs)
-        jobs.append(job)
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(ncpu, _init_render_worker, (job_template, subs)) as pool:
+        for job_file_name, s in pool.imap(_render_in_worker, tasks,
+                                          chunksize=ELB_JOB_RENDER_POOL_CHUNK):
+            with open_for_write(job_file_name) as f:
+                f.write(s)
+            jobs.append(job_file_name)
     return jobs
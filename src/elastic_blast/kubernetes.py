@@ -23,6 +23,7 @@ Help functions to access and manipulate Kubernetes clusters
 
 """
 
+import concurrent.futures
 import json
 import logging
 import os
@@ -51,6 +52,7 @@ from .constants import (
     ELB_K8S_JOB_SUBMISSION_MAX_WAIT,
     ELB_K8S_JOB_SUBMISSION_MIN_WAIT,
     ELB_K8S_JOB_SUBMISSION_TIMEOUT,
+    ELB_K8S_PATCH_MAX_WORKERS,
     ELB_METADATA_DIR,
     ELB_PAUSE_AFTER_INIT_PV,
     ELB_QS_DOCKER_IMAGE_AZURE,
@@ -325,20 +327,23 @@ def delete_all(k8s_ctx: str, dry_run: bool = False) -> list[str]:
 
     Raises:
         util.SafeExecError on problems with command line kubectl"""
-    commands1 = [f'kubectl --context={k8s_ctx} delete jobs --ignore-not-found=true -l app=setup',
-                f'kubectl --context={k8s_ctx} delete jobs --ignore-not-found=true -l app=blast']
-    commands2 = [f'kubectl --context={k8s_ctx} delete pvc --all --force=true',
-                 f'kubectl --context={k8s_ctx} delete pv --all --force=true',
-                 f'kubectl --context={k8s_ctx} delete volumesnapshots --all --ignore-not-found=true --force=true']
-
-    def run_commands(commands: list[str], dry_run: bool) -> list[str]:
+    # One kubectl call per step: a set-based selector covers both job apps
+    # and a comma-separated type list deletes PVCs before PVs. Commands are
+    # argv lists so that the selector is never split on whitespace.
+    kubectl = ['kubectl', f'--context={k8s_ctx}']
+    commands1 = [[*kubectl, 'delete', 'jobs', '--ignore-not-found=true',
+                  '-l', 'app in (setup,blast)']]
+    commands2 = [[*kubectl, 'delete', 'pvc,pv', '--all', '--force=true'],
+                 [*kubectl, 'delete', 'volumesnapshots', '--all', '--ignore-not-found=true', '--force=true']]
+
+    def run_commands(commands: list[list[str]], dry_run: bool) -> list[str]:
         """ Run the commands in the argument list and return the names of the relevant k8s objects.
         This function is specific to delete_all.
         """
         result = []
         for cmd in commands:
             if dry_run:
-                logging.info(cmd)
+                logging.info(' '.join(cmd))
             else:
                 p = safe_exec(cmd)
                 if p.stdout:
@@ -354,44 +359,55 @@ def delete_all(k8s_ctx: str, dry_run: bool = False) -> list[str]:
                                 result.append(fields[0])
         return result
 
-    def delete_finalizers(k8s_ctx: str, dry_run: bool = False):
+    def delete_finalizers(dry_run: bool = False):
         """ Delete finalizers to ensure PV and PVC get deleted
         https://kubernetes.io/docs/tasks/extend-kubernetes/custom-resources/custom-resource-definitions/#finalizers
         """
-        cmd = f'kubectl --context={k8s_ctx} get pv,pvc -o=NAME'
-        for storage_obj in run_commands([cmd], dry_run):
-            cmd = f'kubectl --context={k8s_ctx} patch {storage_obj} -p '
-            cmd += '{"metadata":{"finalizers":null}}'
-            logging.debug(cmd)
-            if dry_run:
-                logging.debug(cmd)
-            else:
+        cmd = [*kubectl, 'get', 'pv,pvc', '-o=NAME']
+
+        def patch(storage_obj: str):
+            cmd = [*kubectl, 'patch', storage_obj, '-p', '{"metadata":{"finalizers":null}}']
+            logging.debug(' '.join(cmd))
+            if not dry_run:
                 p = safe_exec(cmd)
                 if p.stdout:
                     logging.debug(handle_error(p.stdout).rstrip())
 
-    def inspect_storage_objects_for_debugging(k8s_ctx: str, dry_run: bool = False):
-        """ Retrieve information about PV and PVC from kubectl and log it for debugging purposes. """
-        cmd = f'kubectl --context={k8s_ctx} get pv,pvc -o=NAME'
-        for storage_obj in run_commands([cmd], dry_run):
-            cmd = f'kubectl --context={k8s_ctx} describe {storage_obj}'
-            if dry_run:
-                logging.debug(cmd)
-            else:
-                p = safe_exec(cmd)
-                if p.stdout:
-                    for line in handle_error(p.stdout).split('\n'):
-                        if line.startswith("Status") or line.startswith("Finalizers"):
-                            logging.debug(f'{storage_obj} {line}')
+        storage_objs = run_commands([cmd], dry_run)
+        if not storage_objs:
+            return
+        # kubectl patch takes a single object; the patches are independent
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(ELB_K8S_PATCH_MAX_WORKERS, len(storage_objs))) as pool:
+            for f in [pool.submit(patch, obj) for obj in storage_objs]:
+                f.result()
 
-    inspect_storage_objects_for_debugging(k8s_ctx, dry_run)
+    def inspect_storage_objects_for_debugging(dry_run: bool = False):
+        """ Retrieve information about PV and PVC from kubectl and log it for debugging purposes. """
+        if not logging.getLogger().isEnabledFor(logging.DEBUG):
+            return
+        # A single describe of both types instead of one per object
+        cmd = [*kubectl, 'describe', 'pv,pvc']
+        if dry_run:
+            logging.debug(' '.join(cmd))
+            return
+        p = safe_exec(cmd)
+        if p.stdout:
+            storage_obj = ''
+            for line in handle_error(p.stdout).split('\n'):
+                if line.startswith('Name:'):
+                    storage_obj = line.split(maxsplit=1)[-1]
+                elif line.startswith("Status") or line.startswith("Finalizers"):
+                    logging.debug(f'{storage_obj} {line}')
+
+    inspect_storage_objects_for_debugging(dry_run)
     # Delete the jobs first, wait, then delete the pvc and  pv
     deleted1 = run_commands(commands1, dry_run)
     if not dry_run:
         secs2sleep = int(os.getenv('ELB_PAUSE_AFTER_INIT_PV', str(ELB_PAUSE_AFTER_INIT_PV)))
         time.sleep(secs2sleep)
-    delete_finalizers(k8s_ctx, dry_run)
-    inspect_storage_objects_for_debugging(k8s_ctx, dry_run)
+    delete_finalizers(dry_run)
+    inspect_storage_objects_for_debugging(dry_run)
     deleted2 = run_commands(commands2, dry_run)
     return deleted1 + deleted2
 
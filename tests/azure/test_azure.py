@@ -6,10 +6,14 @@ Unit tests for azure module
 Author: Moon Hyuk Choi moonchoi@microsoft.com
 """
 
+import concurrent.futures
+import io
 import json
 import os
 import subprocess
+import time
 from argparse import Namespace
+from collections import defaultdict
 from unittest.mock import patch, MagicMock
 
 import pytest  # type: ignore
@@ -157,6 +161,40 @@ class TestDeleteSnapshot:
             delete_snapshot('', cfg)
 
 
+class TestListDisksAndSnapshots:
+    """Tests for azure.list_disks_and_snapshots()."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_disk_listing(self):
+        azure._disk_listing_cache.clear()
+        yield
+        azure._disk_listing_cache.clear()
+
+    def _cfg(self):
+        cfg = MagicMock()
+        cfg.azure.resourcegroup = 'rg'
+        return cfg
+
+    def test_returns_both_listings_and_caches(self):
+        cfg = self._cfg()
+        with patch('elastic_blast.azure._sdk_get_disks', return_value=['d1']) as disks, \
+             patch('elastic_blast.azure._sdk_get_snapshots', return_value=['s1']) as snaps:
+            assert azure.list_disks_and_snapshots(cfg) == (['d1'], ['s1'])
+            assert azure.list_disks_and_snapshots(cfg) == (['d1'], ['s1'])
+        disks.assert_called_once()
+        snaps.assert_called_once()
+
+    def test_delete_invalidates_cache(self):
+        cfg = self._cfg()
+        with patch('elastic_blast.azure._sdk_get_disks', return_value=['d1']) as disks, \
+             patch('elastic_blast.azure._sdk_get_snapshots', return_value=[]), \
+             patch('elastic_blast.azure._sdk_delete_disk'):
+            azure.list_disks_and_snapshots(cfg)
+            delete_disk('d1', cfg)
+            azure.list_disks_and_snapshots(cfg)
+        assert disks.call_count == 2
+
+
 # ---------------------------------------------------------------------------
 # AKS Cluster tests
 # ---------------------------------------------------------------------------
@@ -210,6 +248,12 @@ class TestGetAksCredentials:
 class TestDeleteClusterWithCleanup:
     """Tests for azure.delete_cluster_with_cleanup()."""
 
+    @pytest.fixture(autouse=True)
+    def fresh_disk_listing(self):
+        azure._disk_listing_cache.clear()
+        yield
+        azure._disk_listing_cache.clear()
+
     def test_successful_cleanup_and_deletion(self, mocker):
         """Full cluster deletion: get credentials, delete k8s resources, delete cluster."""
         cfg = _make_cfg(dry_run=False)
@@ -330,6 +374,112 @@ class TestDeleteClusterWithCleanup:
         azure.delete_cluster.assert_called()
 
 
+class TestWaitForClusterReady:
+    """Tests for azure._wait_for_cluster_ready() polling schedule."""
+
+    def test_backoff_grows_and_resets_on_state_change(self, mocker):
+        cfg = _make_cfg(dry_run=False)
+        starting = AKS_PROVISIONING_STATE.STARTING.value
+        updating = AKS_PROVISIONING_STATE.UPDATING.value
+        mocker.patch('elastic_blast.azure.check_cluster', side_effect=[
+            starting, starting, starting, updating, updating,
+            AKS_PROVISIONING_STATE.SUCCEEDED.value])
+        sleep = mocker.patch('elastic_blast.azure.time.sleep')
+
+        assert azure._wait_for_cluster_ready(cfg)
+        assert [c.args[0] for c in sleep.call_args_list] == [1.0, 1.5, 2.25, 1.0, 1.5]
+
+    @pytest.mark.parametrize('state,usable', [
+        (AKS_PROVISIONING_STATE.SUCCEEDED.value, True),
+        (AKS_PROVISIONING_STATE.FAILED.value, False),
+        (AKS_PROVISIONING_STATE.STOPPING.value, False),
+        (AKS_PROVISIONING_STATE.DELETING.value, False),
+        (AKS_PROVISIONING_STATE.CANCELED.value, True),
+    ])
+    def test_terminal_states_return_without_waiting(self, mocker, state, usable):
+        cfg = _make_cfg(dry_run=False)
+        mocker.patch('elastic_blast.azure.check_cluster', return_value=state)
+        sleep = mocker.patch('elastic_blast.azure.time.sleep')
+        assert azure._wait_for_cluster_ready(cfg) is usable
+        sleep.assert_not_called()
+
+
+class TestCleanupLeakedDisks:
+    """Tests for azure._cleanup_leaked_disks()."""
+
+    def test_one_failed_delete_does_not_stop_the_rest(self, mocker):
+        cfg = _make_cfg(dry_run=False)
+        mocker.patch('elastic_blast.azure.list_disks_and_snapshots',
+                     return_value=(['d1', 'd2', 'd3'], ['s1']))
+        mocker.patch('elastic_blast.azure.delete_disk',
+                     side_effect=lambda name, _: name == 'd2' and 1 / 0)
+        mocker.patch('elastic_blast.azure.delete_snapshot')
+        warn = mocker.patch('elastic_blast.azure._warn_leaked_resource')
+
+        azure._cleanup_leaked_disks(cfg, ['d1', 'd2', 'd3', 'gone'], ['s1'], False)
+        assert sorted(c.args[0] for c in azure.delete_disk.call_args_list) == ['d1', 'd2', 'd3']
+        azure.delete_snapshot.assert_called_once_with('s1', cfg)
+        warn.assert_called_once()
+        assert warn.call_args.args[:2] == ('disk', 'd2')
+
+    def test_listing_failure_warns_without_deleting(self, mocker):
+        cfg = _make_cfg(dry_run=False)
+        mocker.patch('elastic_blast.azure.list_disks_and_snapshots',
+                     side_effect=RuntimeError('ARM down'))
+        mocker.patch('elastic_blast.azure.delete_disk')
+        warn = mocker.patch('elastic_blast.azure._warn_leaked_resource')
+
+        azure._cleanup_leaked_disks(cfg, ['d1'], ['s1'], False)
+        azure.delete_disk.assert_not_called()
+        assert [c.args[:2] for c in warn.call_args_list] == [('disk', 'd1'), ('snapshot', 's1')]
+
+
+class TestGetResourceIds:
+    """Tests for azure._get_resource_ids() and its memoized loader."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_loader(self):
+        azure._load_resource_ids.cache_clear()
+        yield
+        azure._load_resource_ids.cache_clear()
+
+    def _cfg(self):
+        cfg = MagicMock()
+        cfg.appstate.resources.disks = []
+        cfg.appstate.resources.snapshots = []
+        cfg.cluster.results = 'https://account.blob.core.windows.net/results'
+        cfg.azure.elb_job_id = 'job-1'
+        return cfg
+
+    def _open(self, payload):
+        return patch('elastic_blast.azure.open_for_read',
+                     side_effect=lambda path: io.StringIO(payload))
+
+    def test_metadata_is_read_once(self):
+        with self._open('{"disks": ["disk-1"], "snapshots": []}') as m:
+            assert azure._get_resource_ids(self._cfg()).disks == ['disk-1']
+            azure._get_resource_ids(self._cfg()).disks.append('mutated')
+            assert azure._get_resource_ids(self._cfg()).disks == ['disk-1']
+        m.assert_called_once()
+
+    def test_empty_metadata_is_not_cached(self):
+        with self._open('{"disks": [], "snapshots": []}') as m:
+            assert azure._get_resource_ids(self._cfg()).disks == []
+            azure._get_resource_ids(self._cfg())
+        assert m.call_count == 2
+
+    def test_partitioned_init_drops_cached_ids(self):
+        with self._open('{"disks": ["disk-1"], "snapshots": []}'):
+            azure._get_resource_ids(self._cfg())
+        elb = MagicMock(cloud_job_submission=False, auto_shutdown=False)
+        elb.cfg.cluster.reuse = True
+        elb._initial_cluster_status.return_value = 'Succeeded'
+        with patch('elastic_blast.azure.kubernetes'):
+            ElasticBlastAzure._initialize_cluster_partitioned(elb, None)
+        with self._open('{"disks": ["disk-2"], "snapshots": []}'):
+            assert azure._get_resource_ids(self._cfg()).disks == ['disk-2']
+
+
 # ---------------------------------------------------------------------------
 # remove_split_query tests
 # ---------------------------------------------------------------------------
@@ -385,6 +535,366 @@ class TestDecode:
         assert isinstance(result, str)
 
 
+# ---------------------------------------------------------------------------
+# Job status polling tests
+# ---------------------------------------------------------------------------
+
+class TestCountBlastJobs:
+    """Tests for ElasticBlastAzure._count_blast_jobs() single-call polling."""
+
+    def _elb(self, stdout='', side_effect=None):
+        elb = MagicMock(dry_run=False)
+        elb._tally_job_conditions = ElasticBlastAzure._tally_job_conditions
+        elb._kubectl_run.return_value = MockedCompletedProcess(stdout=stdout)
+        elb._kubectl_run.side_effect = side_effect
+        return elb
+
+    def test_counts_jobs_and_pods_from_one_call(self):
+        elb = self._elb('Job\tComplete\t\n'
+                        'Job\tFailed\t\n'
+                        'Job\t\t\n'
+                        'Job\t\t\n'
+                        'Pod\tReady\tRunning\n'
+                        'Pod\tPodScheduled\tPending\n')
+        counts = ElasticBlastAzure._count_blast_jobs(elb)
+        elb._kubectl_run.assert_called_once()
+        assert 'jobs,pods' in elb._kubectl_run.call_args.args
+        assert counts['succeeded'] == 1
+        assert counts['failed'] == 1
+        assert counts['running'] == 1
+        assert counts['pending'] == 1
+
+    def test_repeated_rows_are_counted(self):
+        elb = self._elb('Job\tComplete\t\n' * 5 +
+                        'Job\t\t\n' * 3 +
+                        'Pod\t\tRunning\n' * 2 +
+                        'Pod\t\tSucceeded\n' * 5)
+        counts = ElasticBlastAzure._count_blast_jobs(elb)
+        assert counts['succeeded'] == 5
+        assert counts['failed'] == 0
+        assert counts['running'] == 2
+        assert counts['pending'] == 1
+
+    def test_kubectl_failure_reports_empty_counts(self):
+        elb = self._elb(side_effect=SafeExecError(1, 'boom'))
+        counts = ElasticBlastAzure._count_blast_jobs(elb)
+        assert sum(counts.values()) == 0
+
+
+class TestJobStatusByApp:
+    """Tests for ElasticBlastAzure._job_status_by_app()."""
+
+    def test_tallies_conditions(self):
+        elb = MagicMock(dry_run=False)
+        elb._tally_job_conditions = ElasticBlastAzure._tally_job_conditions
+        elb._kubectl_run.return_value = MockedCompletedProcess(
+            stdout='Complete\nFailed\n<none>\nComplete\n')
+        assert ElasticBlastAzure._job_status_by_app(elb, 'setup') == (1, 2, 1)
+
+    def test_several_apps_share_one_set_based_selector(self):
+        elb = MagicMock(dry_run=False)
+        elb._tally_job_conditions = ElasticBlastAzure._tally_job_conditions
+        elb._kubectl_run.return_value = MockedCompletedProcess(stdout='Failed\n')
+        assert ElasticBlastAzure._job_status_by_app(elb, 'setup', 'submit') == (0, 0, 1)
+        assert 'app in (setup,submit)' in elb._kubectl_run.call_args.args
+
+
+class TestWaitForCloudQuerySplit:
+    """Tests for ElasticBlastAzure.wait_for_cloud_query_split()."""
+
+    def _elb(self, wait_error=None, jsonpath='|'):
+        elb = MagicMock(dry_run=False, query_files=['query.fa'])
+        elb.cfg.cluster.use_local_ssd = False
+        elb._kubectl_run.side_effect = wait_error
+        elb._kubectl_jsonpath.return_value = jsonpath
+        return elb
+
+    def test_returns_when_kubectl_wait_succeeds(self):
+        elb = self._elb()
+        ElasticBlastAzure.wait_for_cloud_query_split(elb)
+        args = elb._kubectl_run.call_args.args
+        assert args[0] == 'wait' and '--for=condition=complete' in args
+        elb._kubectl_jsonpath.assert_not_called()
+
+    def test_failed_job_raises(self):
+        elb = self._elb(wait_error=SafeExecError(1, 'timed out'), jsonpath='|1')
+        with patch('elastic_blast.azure.time.sleep'):
+            with pytest.raises(UserReportError, match='BLASTDB initialization failed'):
+                ElasticBlastAzure.wait_for_cloud_query_split(elb)
+
+    def test_inactive_job_without_failures_returns(self):
+        elb = self._elb(wait_error=SafeExecError(1, 'timed out'), jsonpath='|')
+        with patch('elastic_blast.azure.time.sleep'):
+            ElasticBlastAzure.wait_for_cloud_query_split(elb)
+        elb._kubectl_jsonpath.assert_called_once()
+
+
+class TestBuildSubstitutions:
+    """Tests for ElasticBlastAzure._build_substitutions() memoization."""
+
+    def _elb(self):
+        elb = MagicMock(_subs_cache={})
+        elb.cfg.blast.program = 'blastn'
+        elb.cfg.cluster.num_nodes = 2
+        elb.cfg.cluster.num_cpus = 16
+        elb.cfg.azure.elb_job_id = 'job-0123456789'
+        elb._results_path.return_value = 'results'
+        return elb
+
+    def test_db_lookup_happens_once(self):
+        elb = self._elb()
+        with patch('elastic_blast.azure.get_blastdb_info',
+                   return_value=('db', '', 'db-label')) as info:
+            first = ElasticBlastAzure._build_substitutions(elb, ['q1', 'q2'])
+            first['ELB_SHARD_IDX'] = '0'
+            second = ElasticBlastAzure._build_substitutions(elb, ['q3', 'q4'])
+        info.assert_called_once()
+        assert 'ELB_SHARD_IDX' not in second
+        assert second['ELB_DB'] == 'db'
+
+    def test_cpu_request_depends_on_batches_per_node(self):
+        elb = self._elb()
+        with patch('elastic_blast.azure.get_blastdb_info',
+                   return_value=('db', '', 'db-label')):
+            one_per_node = ElasticBlastAzure._build_substitutions(elb, ['q1', 'q2'])
+            many = ElasticBlastAzure._build_substitutions(elb, ['q1', 'q2', 'q3'])
+        assert one_per_node['ELB_NUM_CPUS_REQ'] == '14'
+        assert many['ELB_NUM_CPUS_REQ'] == '6'
+
+
+class TestFlushMetadata:
+    """Tests for ElasticBlastAzure._flush_metadata()."""
+
+    def test_uploads_all_queued_files_in_one_call(self):
+        elb = MagicMock(_pending_metadata={}, dry_run=False)
+        elb._metadata_path.return_value = 'https://acct.blob.core.windows.net/results/job/metadata/'
+        ElasticBlastAzure._queue_metadata(elb, 'query_length.txt', '42')
+        ElasticBlastAzure._queue_metadata(elb, 'num_jobs_submitted.txt', '7')
+        uploaded = {}
+
+        def fake_exec(cmd):
+            src_dir = os.path.dirname(cmd[2])
+            for name in os.listdir(src_dir):
+                with open(os.path.join(src_dir, name)) as f:
+                    uploaded[name] = f.read()
+            return MockedCompletedProcess()
+
+        with patch('elastic_blast.azure.safe_exec', side_effect=fake_exec) as exec_mock:
+            ElasticBlastAzure._flush_metadata(elb)
+            ElasticBlastAzure._flush_metadata(elb)
+        exec_mock.assert_called_once()
+        assert exec_mock.call_args.args[0][3].endswith('/metadata/')
+        assert uploaded == {'query_length.txt': '42', 'num_jobs_submitted.txt': '7'}
+        assert elb._pending_metadata == {}
+
+    def test_azcopy_failure_is_logged_not_raised(self, caplog):
+        elb = MagicMock(_pending_metadata={}, dry_run=False)
+        elb._metadata_path.return_value = 'https://acct.blob.core.windows.net/results/job/metadata/'
+        ElasticBlastAzure._queue_metadata(elb, 'query_length.txt', '42')
+        with patch('elastic_blast.azure.safe_exec',
+                   side_effect=SafeExecError(1, 'azcopy: 403 AuthorizationFailure')):
+            ElasticBlastAzure._flush_metadata(elb)
+        assert 'Failed to upload metadata' in caplog.text
+        assert elb._pending_metadata == {}
+
+
+class TestLabelNodes:
+    """Tests for ElasticBlastAzure._label_nodes()."""
+
+    def test_labels_every_node_with_its_ordinal(self):
+        elb = MagicMock()
+        elb.cfg.cluster.use_local_ssd = True
+        elb.cfg.cluster.dry_run = False
+        elb._kubectl_jsonpath.return_value = 'node-a node-b node-c'
+        ElasticBlastAzure._label_nodes(elb)
+        calls = sorted(c.args for c in elb._kubectl_run.call_args_list)
+        assert calls == [('label', 'nodes', 'node-a', 'ordinal=0', '--overwrite'),
+                         ('label', 'nodes', 'node-b', 'ordinal=1', '--overwrite'),
+                         ('label', 'nodes', 'node-c', 'ordinal=2', '--overwrite')]
+
+    def test_missing_node_is_not_recreated(self):
+        elb = MagicMock()
+        elb.cfg.cluster.use_local_ssd = True
+        elb.cfg.cluster.dry_run = False
+        elb._kubectl_jsonpath.return_value = 'node-a'
+        elb._kubectl_run.side_effect = SafeExecError(1, 'Error from server (NotFound): nodes "node-a" not found')
+        with pytest.raises(SafeExecError):
+            ElasticBlastAzure._label_nodes(elb)
+
+    def test_noop_without_local_ssd(self):
+        elb = MagicMock()
+        elb.cfg.cluster.use_local_ssd = False
+        ElasticBlastAzure._label_nodes(elb)
+        elb._kubectl_run.assert_not_called()
+
+
+class TestInitialClusterStatus:
+    """Tests for ElasticBlastAzure._initial_cluster_status()."""
+
+    def _elb(self, result, age):
+        elb = MagicMock()
+        future = concurrent.futures.Future()
+        future.set_result(result)
+        elb._cluster_status_prefetch = future
+        elb._cluster_status_pool = MagicMock()
+        elb._cluster_status_prefetched_at = time.monotonic() - age
+        return elb
+
+    def test_fresh_prefetch_is_used(self):
+        elb = self._elb('Succeeded', age=1)
+        with patch('elastic_blast.azure.check_cluster') as m:
+            assert ElasticBlastAzure._initial_cluster_status(elb) == 'Succeeded'
+        m.assert_not_called()
+
+    def test_expired_prefetch_is_refreshed(self):
+        elb = self._elb('Creating', age=azure._CLUSTER_STATUS_PREFETCH_TTL_S + 1)
+        pool = elb._cluster_status_pool
+        with patch('elastic_blast.azure.check_cluster', return_value='Succeeded') as m:
+            assert ElasticBlastAzure._initial_cluster_status(elb) == 'Succeeded'
+        m.assert_called_once_with(elb.cfg)
+        pool.shutdown.assert_called_once_with(wait=True)
+
+    def test_prefetch_is_used_once(self):
+        elb = self._elb('Succeeded', age=1)
+        with patch('elastic_blast.azure.check_cluster', return_value='Creating') as m:
+            ElasticBlastAzure._initial_cluster_status(elb)
+            assert ElasticBlastAzure._initial_cluster_status(elb) == 'Creating'
+        m.assert_called_once()
+
+
+class TestDeriveStatus:
+    """Tests for ElasticBlastAzure._derive_status() setup/submit fallback."""
+
+    def _elb(self, failed=0):
+        elb = MagicMock()
+        elb._job_status_by_app.return_value = (0, 0, failed)
+        return elb
+
+    def test_queries_setup_and_submit_when_no_blast_jobs(self):
+        elb = self._elb()
+        status = ElasticBlastAzure._derive_status(elb, defaultdict(int))
+        assert status == ElbStatus.SUBMITTING
+        elb._job_status_by_app.assert_called_once_with('setup', 'submit')
+
+    def test_failed_setup_or_submit_job_is_failure(self):
+        status = ElasticBlastAzure._derive_status(self._elb(failed=1), defaultdict(int))
+        assert status == ElbStatus.FAILURE
+
+
+# ---------------------------------------------------------------------------
+# kubectl context disk cache tests
+# ---------------------------------------------------------------------------
+
+class TestK8sCtxCache:
+    """Tests for the on-disk kubectl context cache used by _get_k8s_ctx()."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(azure, '_AKS_CTX_CACHE_DIR', str(tmp_path))
+        return tmp_path
+
+    def _elb(self):
+        elb = MagicMock(dry_run=False)
+        elb.cfg.azure.user = 'user@example.com'
+        elb.cfg.azure.resourcegroup = 'rg'
+        elb.cfg.cluster.name = 'elb-cluster'
+        elb.cfg.appstate.k8s_ctx = None
+        return elb
+
+    def test_file_name_does_not_leak_identity(self, cache_dir):
+        azure._save_cached_k8s_ctx(self._elb().cfg, 'ctx')
+        names = [p.name for p in cache_dir.iterdir()]
+        assert len(names) == 1
+        assert 'elb-cluster' not in names[0] and names[0].startswith('aks-ctx-')
+
+    def test_expired_entry_is_ignored(self):
+        cfg = self._elb().cfg
+        azure._save_cached_k8s_ctx(cfg, 'ctx')
+        assert azure._load_cached_k8s_ctx(cfg) == 'ctx'
+        with patch('elastic_blast.azure.time.time', return_value=4102444800.0):
+            assert azure._load_cached_k8s_ctx(cfg) is None
+
+    def test_second_lookup_skips_credentials_call(self):
+        with patch('elastic_blast.azure.get_aks_credentials', return_value='ctx') as m:
+            assert ElasticBlastAzure._get_k8s_ctx(self._elb()) == 'ctx'
+            assert ElasticBlastAzure._get_k8s_ctx(self._elb()) == 'ctx'
+        m.assert_called_once()
+
+    def test_init_path_bypasses_cached_context(self):
+        elb = self._elb()
+        azure._save_cached_k8s_ctx(elb.cfg, 'stale')
+        with patch('elastic_blast.azure.get_aks_credentials', return_value='fresh') as m:
+            assert ElasticBlastAzure._get_k8s_ctx(elb, use_disk_cache=False) == 'fresh'
+        m.assert_called_once()
+        assert azure._load_cached_k8s_ctx(elb.cfg) == 'fresh'
+
+    @pytest.mark.parametrize('stderr', [
+        'error: You must be logged in to the server (Unauthorized)',
+        'dial tcp: lookup elb-cluster-dns.hcp.eastus.azmk8s.io: no such host',
+        'x509: certificate signed by unknown authority',
+    ])
+    def test_stale_context_is_dropped_and_retried(self, stderr):
+        elb = self._elb()
+        azure._save_cached_k8s_ctx(elb.cfg, 'ctx')
+        elb._kubectl_argv.return_value = ['kubectl', '--context=ctx']
+        with patch('elastic_blast.azure.safe_exec',
+                   side_effect=[SafeExecError(1, stderr), 'ok']) as m:
+            assert ElasticBlastAzure._kubectl_run(elb, 'get', 'jobs') == 'ok'
+        assert m.call_count == 2
+        elb._get_k8s_ctx.assert_called_once_with(use_disk_cache=False)
+        assert azure._load_cached_k8s_ctx(elb.cfg) is None
+
+    def test_other_kubectl_errors_are_not_retried(self):
+        elb = self._elb()
+        azure._save_cached_k8s_ctx(elb.cfg, 'ctx')
+        elb._kubectl_argv.return_value = ['kubectl', '--context=ctx']
+        with patch('elastic_blast.azure.safe_exec',
+                   side_effect=SafeExecError(1, 'Error from server (NotFound)')) as m:
+            with pytest.raises(SafeExecError):
+                ElasticBlastAzure._kubectl_run(elb, 'get', 'jobs')
+        m.assert_called_once()
+        assert azure._load_cached_k8s_ctx(elb.cfg) == 'ctx'
+
+    def test_delete_cluster_drops_cached_context(self):
+        cfg = self._elb().cfg
+        cfg.cluster.dry_run = False
+        azure._save_cached_k8s_ctx(cfg, 'ctx')
+        with patch('elastic_blast.azure._sdk_delete_cluster', return_value=None), \
+             patch('elastic_blast.azure.track_cluster_deleted'):
+            azure.delete_cluster(cfg)
+        assert azure._load_cached_k8s_ctx(cfg) is None
+
+    def test_start_cluster_drops_cached_context(self):
+        cfg = self._elb().cfg
+        cfg.cluster.dry_run = False
+        cfg.cluster.labels = ''
+        azure._save_cached_k8s_ctx(cfg, 'ctx')
+        with patch('elastic_blast.azure._sdk_start_cluster', return_value=None):
+            azure.start_cluster_async(cfg)
+        assert azure._load_cached_k8s_ctx(cfg) is None
+
+    def test_cleanup_reuses_cached_context(self):
+        cfg = self._elb().cfg
+        azure._save_cached_k8s_ctx(cfg, 'ctx')
+        with patch('elastic_blast.azure.get_aks_credentials') as creds, \
+             patch('elastic_blast.azure.kubernetes') as k8s:
+            azure._cleanup_k8s_resources(cfg, [], [], False)
+        creds.assert_not_called()
+        k8s.check_server.assert_called_once_with('ctx', False)
+        assert cfg.appstate.k8s_ctx == 'ctx'
+
+    def test_cleanup_refetches_when_cached_context_is_rejected(self):
+        cfg = self._elb().cfg
+        azure._save_cached_k8s_ctx(cfg, 'stale')
+        with patch('elastic_blast.azure.get_aks_credentials', return_value='fresh') as creds, \
+             patch('elastic_blast.azure.kubernetes') as k8s:
+            k8s.check_server.side_effect = [SafeExecError(1, 'Unauthorized'), None]
+            azure._cleanup_k8s_resources(cfg, [], [], False)
+        creds.assert_called_once()
+        assert cfg.appstate.k8s_ctx == 'fresh'
+        assert azure._load_cached_k8s_ctx(cfg) is None
+
+
 # ---------------------------------------------------------------------------
 # Cluster name validation tests
 # ---------------------------------------------------------------------------
@@ -490,4 +1000,42 @@ def test_get_aks_credentials_no_cluster_real():
     cfg.cluster.name = 'some-strange-cluster-name'
     assert cfg.cluster.name not in azure.get_aks_clusters(cfg)
     with pytest.raises(SafeExecError):
-        azure.get_aks_credentials(cfg)
\ No newline at end of file
+        azure.get_aks_credentials(cfg)
+
+
+class TestResolveSubscriptionId:
+    """Tests for azure._resolve_subscription_id_uncached()."""
+
+    def test_env_var_skips_az_cli(self, monkeypatch):
+        monkeypatch.setenv('AZURE_SUBSCRIPTION_ID', ' 0000-sub ')
+        with patch('elastic_blast.azure.subprocess.run') as run:
+            assert azure._resolve_subscription_id_uncached() == '0000-sub'
+        run.assert_not_called()
+
+    def test_falls_back_to_az_cli(self, monkeypatch):
+        monkeypatch.delenv('AZURE_SUBSCRIPTION_ID', raising=False)
+        with patch('elastic_blast.azure.subprocess.run',
+                   return_value=subprocess.CompletedProcess([], 0, stdout='1111-sub\n')):
+            assert azure._resolve_subscription_id_uncached() == '1111-sub'
+
+
+class TestSdkSetRoleAssignments:
+    """Tests for azure._sdk_set_role_assignments()."""
+
+    def test_assigns_all_three_roles(self):
+        clients = MagicMock(subscription_id='sub')
+        clients.aks.managed_clusters.get.return_value.identity_profile = {
+            'kubeletidentity': MagicMock(object_id='kubelet')}
+        clients.storage.storage_accounts.get_properties.return_value.id = 'sa-id'
+        with patch('elastic_blast.azure._get_clients', return_value=clients):
+            azure._sdk_set_role_assignments('rg', 'cluster', 'sa', 'acr', 'acr-rg')
+        calls = clients.auth.role_assignments.create.call_args_list
+        assert sorted(c.args[0] for c in calls) == sorted([
+            'sa-id', '/subscriptions/sub',
+            '/subscriptions/sub/resourceGroups/acr-rg/providers/Microsoft.ContainerRegistry/registries/acr'])
+        assert all(c.args[2]['principal_id'] == 'kubelet' for c in calls)
+
+    def test_dry_run_makes_no_calls(self):
+        with patch('elastic_blast.azure._get_clients') as get_clients:
+            azure._sdk_set_role_assignments('rg', 'cluster', 'sa', 'acr', 'acr-rg', dry_run=True)
+        get_clients.assert_not_called()
@@ -33,6 +33,7 @@ from unittest.mock import patch, MagicMock
 
 import pytest
 
+from elastic_blast import azure
 from elastic_blast.azure import (
     check_cluster,
     start_cluster,
@@ -82,6 +83,12 @@ def _make_cfg(dry_run: bool = True) -> ElasticBlastConfig:
 class TestCheckCluster:
     """Tests for azure.check_cluster() — delegates to SDK."""
 
+    @pytest.fixture(autouse=True)
+    def fresh_cluster_state(self):
+        azure._cluster_state_cache.clear()
+        yield
+        azure._cluster_state_cache.clear()
+
     def test_returns_succeeded_for_running_cluster(self):
         cfg = _make_cfg(dry_run=False)
         with patch('elastic_blast.azure._sdk_check_cluster', return_value='Succeeded'):
@@ -108,6 +115,29 @@ class TestCheckCluster:
             check_cluster(cfg)
         m.assert_called_once_with(cfg.azure.resourcegroup, cfg.cluster.name, cfg.cluster.dry_run)
 
+    def test_repeated_calls_within_ttl_are_cached(self):
+        cfg = _make_cfg(dry_run=False)
+        with patch('elastic_blast.azure._sdk_check_cluster', return_value='Succeeded') as m:
+            assert check_cluster(cfg) == 'Succeeded'
+            assert check_cluster(cfg) == 'Succeeded'
+        m.assert_called_once()
+
+    def test_cache_expires_after_ttl(self):
+        cfg = _make_cfg(dry_run=False)
+        with patch('elastic_blast.azure._sdk_check_cluster', side_effect=['Creating', 'Succeeded']), \
+             patch('elastic_blast.azure._CLUSTER_STATE_TTL_S', 0):
+            assert check_cluster(cfg) == 'Creating'
+            assert check_cluster(cfg) == 'Succeeded'
+
+    def test_delete_cluster_invalidates_cache(self):
+        cfg = _make_cfg(dry_run=False)
+        with patch('elastic_blast.azure._sdk_check_cluster', side_effect=['Succeeded', '']), \
+             patch('elastic_blast.azure._sdk_delete_cluster', return_value=None), \
+             patch('elastic_blast.azure.track_cluster_deleted'):
+            assert check_cluster(cfg) == 'Succeeded'
+            delete_cluster(cfg)
+            assert check_cluster(cfg) == ''
+
 
 class TestGetAksClusters:
     """Tests for azure.get_aks_clusters() — delegates to SDK."""
@@ -24,7 +24,9 @@ Unit tests for elastic_blast.azure_traits
 Author: Victor Joukov joukovv@ncbi.nlm.nih.gov
 """
 from elastic_blast.azure_traits import get_machine_properties, get_instance_type_offerings
+from elastic_blast.azure_traits import get_blob_service_client
 from elastic_blast.base import InstanceProperties
+from unittest.mock import patch
 import os
 import pytest
 
@@ -66,3 +68,17 @@ def test_get_instance_type_offerings():
     assert 'Standard_E32s_v3' in [item['name'] for item in result]
     assert 'Standard_E64s_v3' in [item['name'] for item in result]
     assert 'Standard_E64is_v3' in [item['name'] for item in result]
+
+@pytest.fixture
+def fresh_blob_service_clients():
+    """Start and end with an empty blob service client cache"""
+    get_blob_service_client.cache_clear()
+    yield
+    get_blob_service_client.cache_clear()
+
+def test_blob_service_client_is_reused_per_account(fresh_blob_service_clients):
+    with patch('elastic_blast.azure_traits.DefaultAzureCredential') as cred:
+        first = get_blob_service_client('account1')
+        assert get_blob_service_client('account1') is first
+        assert get_blob_service_client('account2') is not first
+    assert cred.call_count == 2
@@ -29,14 +29,16 @@ import os
 from argparse import Namespace
 from unittest.mock import patch, MagicMock
 import pytest  # type: ignore
+from tenacity import wait_none
 from elastic_blast import gcp
 from elastic_blast import kubernetes
 from elastic_blast import config
 from elastic_blast import elb_config
 from elastic_blast import util
 from elastic_blast.constants import CLUSTER_ERROR, ElbCommand
+from elastic_blast.constants import ELB_METADATA_DIR, ELB_STATE_DISK_ID_FILE
 from elastic_blast.util import SafeExecError, UserReportError
-from elastic_blast.elb_config import ElasticBlastConfig
+from elastic_blast.elb_config import ElasticBlastConfig, ResourceIds
 from elastic_blast.db_metadata import DbMetadata
 from tests.utils import MockedCompletedProcess
 from tests.utils import mocked_safe_exec, get_mocked_config
@@ -186,6 +188,36 @@ def test_get_gke_clusters_empty(mocker):
     gcp.safe_exec.assert_called()
 
 
+@patch(target='elastic_blast.elb_config.gcp_get_regions', new=MagicMock(return_value=GCP_REGIONS))
+def test_get_resource_ids(gke_mock):
+    """Test reading recorded resource ids from GCS"""
+    cfg = get_mocked_config()
+    key = os.path.join(cfg.cluster.results, ELB_METADATA_DIR, ELB_STATE_DISK_ID_FILE)
+    gke_mock.cloud.storage[key] = ResourceIds(disks=[GCP_DISKS[0]]).to_json()
+    assert gcp._get_resource_ids(cfg).disks == [GCP_DISKS[0]]
+
+
+@patch(target='elastic_blast.elb_config.gcp_get_regions', new=MagicMock(return_value=GCP_REGIONS))
+def test_get_resource_ids_not_found(gke_mock):
+    """Test that a missing resource id file yields no ids and is not retried"""
+    cfg = get_mocked_config()
+    gcp.safe_exec.reset_mock()
+    resources = gcp._get_resource_ids(cfg)
+    assert not resources.disks and not resources.snapshots
+    gcp.safe_exec.assert_called_once()
+
+
+@patch(target='elastic_blast.elb_config.gcp_get_regions', new=MagicMock(return_value=GCP_REGIONS))
+def test_get_resource_ids_read_error(gke_mock, mocker):
+    """Test that other gsutil failures are retried and then re-raised"""
+    cfg = get_mocked_config()
+    mocker.patch('elastic_blast.gcp.safe_exec',
+                 side_effect=SafeExecError(returncode=1, message='ServiceException: 503 Backend Error'))
+    with pytest.raises(SafeExecError):
+        gcp._get_resource_ids.retry_with(wait=wait_none())(cfg)
+    assert gcp.safe_exec.call_count == 3
+
+
 @patch(target='elastic_blast.elb_config.gcp_get_regions', new=MagicMock(return_value=GCP_REGIONS))
 def test_delete_cluster_with_cleanup(gke_mock):
     """Test deleting GKE cluster and its persistent disks"""
@@ -447,7 +479,7 @@ def test_remove_split_query(mocker):
 
     def safe_exec_gsutil_rm(cmd):
         """Mocked util.safe_exec function that simulates gsutil rm"""
-        if cmd != f'gsutil -mq rm {QUERIES}':
+        if cmd != f'gsutil -o GSUtil:parallel_thread_count=16 -mq rm {QUERIES}':
             raise ValueError(f'Bad gsutil command line: {cmd}')
         return MockedCompletedProcess('')
 
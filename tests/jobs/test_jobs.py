@@ -72,3 +72,22 @@ def test_default_template():
 def test_missing_template():
     with pytest.raises(FileNotFoundError):
         read_job_template('some_wild_and_non_existing_name.template')
+
+
+def test_jobs_parallel_render(test_dir, monkeypatch):
+    """Job files rendered in a process pool match serially rendered ones"""
+    import elastic_blast.jobs
+    template = '$QUERY_NUM $BLAST_ELB_BATCH_NUM ${RESULTS}'
+    queries = [f'gs://test-bucket/batch_{i:03d}.fa' for i in range(10)]
+    serial = write_job_files(os.path.join(test_dir, 'serial'), 'job_', template,
+                             queries, RESULTS='res')
+    monkeypatch.setattr(elastic_blast.jobs, 'ELB_JOB_RENDER_POOL_MIN_JOBS', 2)
+    monkeypatch.setattr(elastic_blast.jobs.os, 'cpu_count', lambda: 2)
+    parallel = write_job_files(os.path.join(test_dir, 'parallel'), 'job_', template,
+                               queries, RESULTS='res')
+    assert [os.path.basename(f) for f in parallel] == [os.path.basename(f) for f in serial]
+    for s, p in zip(serial, parallel):
+        with open(s) as fs, open(p) as fp:
+            assert fs.read() == fp.read()
+    with open(parallel[7]) as f:
+        assert f.read() == '007 7 res'
@@ -235,6 +235,25 @@ def test_delete_all(gke_mock):
     kubernetes.safe_exec.assert_called()
 
 
+@patch.dict(os.environ, {'ELB_PAUSE_AFTER_INIT_PV': '0'})
+def test_delete_all_batches_kubectl_calls(mocker):
+    """Test that jobs of both apps, and PVCs with PVs, are each deleted by one kubectl call"""
+    commands = []
+    def safe_exec_record(cmd):
+        """Mocked safe_exec recording command lines"""
+        # every command is passed as an argv list, never re-split
+        assert isinstance(cmd, list)
+        commands.append(' '.join(cmd))
+        return MockedCompletedProcess('No resources found')
+
+    mocker.patch('elastic_blast.kubernetes.safe_exec', side_effect=safe_exec_record)
+    kubernetes.delete_all(K8S_UNINITIALIZED_CONTEXT)
+    deletes = [c for c in commands if ' delete ' in c]
+    assert len(deletes) == 3
+    assert deletes[0].endswith('delete jobs --ignore-not-found=true -l app in (setup,blast)')
+    assert ' delete pvc,pv --all ' in deletes[1]
+
+
 @patch.dict(os.environ, {'ELB_PAUSE_AFTER_INIT_PV': '1'})
 def test_delete_all_no_resources(mocker):
     """Test deleting all whem no resources were created"""
@@ -49,6 +49,45 @@ import pytest
 TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
 
 
+# Canned EC2 responses, built once and shared by every mocked call
+EC2_INSTANCE_TYPE_OFFERINGS = {'InstanceTypeOfferings': [{'InstanceType': 'm5.8xlarge'},
+                                                         {'InstanceType': 'm5.4xlarge'},
+                                                         {'InstanceType': 'r5.4xlarge'}]}
+
+EC2_INSTANCE_TYPES = {'InstanceTypes': [{'InstanceType': 'm5.8xlarge',
+                                         'MemoryInfo': {'SizeInMiB': 131072},
+                                         'VCpuInfo': {'DefaultVCpus': 32}
+                                        },
+                                        {'InstanceType': 'm5.4xlarge',
+                                         'MemoryInfo': {'SizeInMiB': 65536},
+                                         'VCpuInfo': {'DefaultVCpus': 16}
+                                        },
+                                        {'InstanceType': 'r5.4xlarge',
+                                         'MemoryInfo': {'SizeInMiB': 131072},
+                                         'VCpuInfo': {'DefaultVCpus': 16}
+                                        }]}
+
+
+class MockedEc2Client:
+    """Mocked boto3 ec2 client"""
+    @staticmethod
+    def describe_instance_type_offerings(LocationType=None, Filters=None):
+        """Mocked function to to get AWS instance type offerings"""
+        return EC2_INSTANCE_TYPE_OFFERINGS
+
+    @staticmethod
+    def describe_instance_types(InstanceTypes=None, Filters=None):
+        """Mocked function to get description of AWS instance types"""
+        return EC2_INSTANCE_TYPES
+
+
+@pytest.fixture(scope='module', autouse=True)
+def mocked_boto3_client():
+    """Patch boto3.client once for the whole module"""
+    with patch(target='boto3.client', new=lambda *args, **kwargs: MockedEc2Client):
+        yield
+
+
 def test_db_data_from_db_metadata():
     """Test creation of an DbData object"""
     db_metadata = DbMetadata(version = '1',
@@ -65,53 +104,36 @@ def test_db_data_from_db_metadata():
     db_data = DbData.from_metadata(db_metadata)
 
 
-def test_get_mt_mode():
+# Protein queries shared by the test_get_mt_mode cases; get_mt_mode only
+# reads them
+QUERY_20K = SeqData(length = 20000, moltype = MolType.PROTEIN)
+QUERY_200K = SeqData(length = 200000, moltype = MolType.PROTEIN)
+QUERY_5M = SeqData(length = 5000000, moltype = MolType.PROTEIN)
+
+
+@pytest.mark.parametrize('dbtype, db_letters, program, options, query, expected', [
+    ('Protein', 10000000, 'blastp', '', QUERY_200K, MTMode.QUERY),
+    ('Protein', 50000000000, 'blastp', '', QUERY_20K, MTMode.DB),
+    ('Protein', 50000000000, 'blastp', '-taxidlist list', QUERY_200K, MTMode.QUERY),
+    ('Nucleotide', 1000, 'blastp', '', QUERY_5M, MTMode.QUERY),
+    ('Nucleotide', 20000000000, 'blastp', '', QUERY_5M, MTMode.DB),
+    ('Nucleotide', 500, 'tblastn', '', QUERY_5M, MTMode.QUERY),
+    ('Nucleotide', 500, 'tblastx', '', QUERY_5M, MTMode.DB),
+])
+def test_get_mt_mode(dbtype, db_letters, program, options, query, expected):
     """Test computing BLAST search MT mode"""
     db_metadata = DbMetadata(version = '1',
                              dbname = 'testdb',
-                             dbtype = 'Protein',
+                             dbtype = dbtype,
                              description = 'A test database',
-                             number_of_letters = 10000000,
+                             number_of_letters = db_letters,
                              number_of_sequences = 5,
                              files = [],
                              last_updated = 'a date',
                              bytes_total = 125,
                              bytes_to_cache = 100,
                              number_of_volumes = 1)
-
-    query = SeqData(length = 200000, moltype = MolType.PROTEIN)
-    assert get_mt_mode(program = 'blastp', options = '', db_metadata = db_metadata, query = query) == MTMode.QUERY
-
-
-    db_metadata.dbtype = 'Protein'
-    db_metadata.number_of_letters = 50000000000
-    query = SeqData(length = 20000, moltype = MolType.PROTEIN)
-    assert get_mt_mode(program = 'blastp', options = '', db_metadata = db_metadata, query = query) == MTMode.DB
-
-    db_metadata.dbtype = 'Protein'
-    db_metadata.number_of_letters = 50000000000
-    query = SeqData(length = 200000, moltype = MolType.PROTEIN)
-    assert get_mt_mode(program = 'blastp', options = '-taxidlist list', db_metadata = db_metadata, query = query) == MTMode.QUERY
-
-    db_metadata.dbtype = 'Nucleotide'
-    db_metadata.number_of_letters = 1000
-    query = SeqData(length = 5000000, moltype = MolType.PROTEIN)
-    assert get_mt_mode(program = 'blastp', options = '', db_metadata = db_metadata, query = query) == MTMode.QUERY
-
-    db_metadata.dbtype = 'Nucleotide'
-    db_metadata.number_of_letters = 20000000000
-    query = SeqData(length = 5000000, moltype = MolType.PROTEIN)
-    assert get_mt_mode(program = 'blastp', options = '', db_metadata = db_metadata, query = query) == MTMode.DB
-
-    db_metadata.dbtype = 'Nucleotide'
-    db_metadata.number_of_letters = 500
-    query = SeqData(length = 5000000, moltype = MolType.PROTEIN)
-    assert get_mt_mode(program = 'tblastn', options = '', db_metadata = db_metadata, query = query) == MTMode.QUERY
-
-    db_metadata.dbtype = 'Nucleotide'
-    db_metadata.number_of_letters = 500
-    query = SeqData(length = 5000000, moltype = MolType.PROTEIN)
-    assert get_mt_mode(program = 'tblastx', options = '', db_metadata = db_metadata, query = query) == MTMode.DB
+    assert get_mt_mode(program = program, options = options, db_metadata = db_metadata, query = query) == expected
 
 
 def test_MTMode():
@@ -135,40 +157,42 @@ def test_get_num_cpus():
 
 def test_get_batch_length():
     """Test computing batch length"""
+    # default batch sizes, looked up once for each program used below
+    batch_size = {p: get_query_batch_size(p) for p in ['blastx', 'blastp', 'rpsblast', 'blastn']}
     PROGRAM = 'blastx'
     NUM_CPUS = 16
     assert get_batch_length(CSP.AWS, program = PROGRAM, task = None,
                             mt_mode = MTMode.DB,
-                            num_cpus = NUM_CPUS) == get_query_batch_size(PROGRAM)
+                            num_cpus = NUM_CPUS) == batch_size[PROGRAM]
 
     PROGRAM = 'blastp'
     assert get_batch_length(CSP.AWS, program = PROGRAM, task = None,
                             mt_mode = MTMode.QUERY,
-                            num_cpus = NUM_CPUS) == get_query_batch_size(PROGRAM) * NUM_CPUS * 2
+                            num_cpus = NUM_CPUS) == batch_size[PROGRAM] * NUM_CPUS * 2
 
     PROGRAM = 'rpsblast'
     NUM_CPUS = 16
     assert get_batch_length(CSP.AWS, program = PROGRAM, task = None,
                             mt_mode = MTMode.QUERY,
-                            num_cpus = NUM_CPUS) == get_query_batch_size(PROGRAM) * NUM_CPUS * 2
+                            num_cpus = NUM_CPUS) == batch_size[PROGRAM] * NUM_CPUS * 2
 
     PROGRAM = 'rpsblast'
     NUM_CPUS = 100
     assert get_batch_length(CSP.GCP, program = PROGRAM, task = None,
                             mt_mode = MTMode.QUERY,
-                            num_cpus = NUM_CPUS) == get_query_batch_size(PROGRAM) * MAX_NUM_THREADS_GCP * 2
+                            num_cpus = NUM_CPUS) == batch_size[PROGRAM] * MAX_NUM_THREADS_GCP * 2
 
     PROGRAM = 'blastn'
     NUM_CPUS = 100
     assert get_batch_length(CSP.GCP, program = PROGRAM, task = None,
                             mt_mode = MTMode.DB,
-                            num_cpus = NUM_CPUS) == get_query_batch_size(PROGRAM)
+                            num_cpus = NUM_CPUS) == batch_size[PROGRAM]
 
     PROGRAM = 'blastn'
     NUM_CPUS = 100
     assert get_batch_length(CSP.GCP, program = PROGRAM, task = 'megablast',
                             mt_mode = MTMode.DB,
-                            num_cpus = NUM_CPUS) == get_query_batch_size(PROGRAM)
+                            num_cpus = NUM_CPUS) == batch_size[PROGRAM]
 
     PROGRAM = 'blastn'
     NUM_CPUS = 100
@@ -256,31 +280,6 @@ def test_get_mem_limit_instance_too_small():
     assert 'does not have enough memory' in err.value.message
 
 
-class MockedEc2Client:
-    """Mocked boto3 ec2 client"""
-    def describe_instance_type_offerings(LocationType, Filters):
-        """Mocked function to to get AWS instance type offerings"""
-        return {'InstanceTypeOfferings': [{'InstanceType': 'm5.8xlarge'},
-                                          {'InstanceType': 'm5.4xlarge'},
-                                          {'InstanceType': 'r5.4xlarge'}]}
-
-    def describe_instance_types(InstanceTypes, Filters):
-        """Mocked function to get description of AWS instance types"""
-        return {'InstanceTypes': [{'InstanceType': 'm5.8xlarge',
-                                   'MemoryInfo': {'SizeInMiB': 131072},
-                                   'VCpuInfo': {'DefaultVCpus': 32}
-                                  },
-                                  {'InstanceType': 'm5.4xlarge',
-                                   'MemoryInfo': {'SizeInMiB': 65536},
-                                   'VCpuInfo': {'DefaultVCpus': 16}
-                                  },
-                                  {'InstanceType': 'r5.4xlarge',
-                                   'MemoryInfo': {'SizeInMiB': 131072},
-                                   'VCpuInfo': {'DefaultVCpus': 16}
-                                  }]}
-
-
-@patch(target='boto3.client', new=MagicMock(return_value=MockedEc2Client))
 def test_aws_get_machine_type():
     """Test selecting machine type for AWS"""
     MIN_CPUS = 8
@@ -312,7 +311,6 @@ def test_gcp_get_machine_type():
         gcp_get_machine_type(memory=MemoryStr('1026Gi'), num_cpus=NUM_CPUS)
 
 
-@patch(target='boto3.client', new=MagicMock(return_value=MockedEc2Client))
 def test_get_machine_type():
     """Test selecting machine type"""
     db_metadata = DbMetadata(version = '1.1',
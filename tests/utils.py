@@ -258,7 +258,7 @@ class CloudResources:
     conf: dict[str, str] = field(default_factory=dict)
 
 
-def mocked_safe_exec(cmd: list[str] | str, env: dict[str, str] | None = None, cloud_state: CloudResources = None) -> MockedCompletedProcess:
+def mocked_safe_exec(cmd: list[str] | str, env: dict[str, str] | None = None, cloud_state: CloudResources = None, timeout: float | None = None) -> MockedCompletedProcess:
     """Substitute for util.safe_exec function that calls command line gcloud
     or kubectl. It emulates gcloud or kubectl stdout for recognized parameters.
 
@@ -386,14 +386,10 @@ def mocked_safe_exec(cmd: list[str] | str, env: dict[str, str] | None = None, cl
     elif cmd[0] == 'kubectl' and 'delete jobs' in ' '.join(cmd):
        return MockedCompletedProcess('\n'.join(['deleted ' + i for i in K8S_JOBS]) + '\n')
 
-    # delete all pvcs
-    elif cmd[0] == 'kubectl' and  'delete pvc --all' in ' '.join(cmd):
+    # delete all pvcs and pvs
+    elif cmd[0] == 'kubectl' and  'delete pvc,pv --all' in ' '.join(cmd):
         return MockedCompletedProcess('\n'.join(['deleted ' + i for i in GKE_PVS]) + '\n')
 
-    # delete all pvs
-    elif cmd[0] == 'kubectl' and 'delete pv --all' in ' '.join(cmd):
-        return MockedCompletedProcess('\n')
-
     # delete all volume snapshots
     elif cmd[0] == 'kubectl' and 'delete volumesnapshots --all' in ' '.join(cmd):
         return MockedCompletedProcess('\n')
@@ -445,6 +441,12 @@ def mocked_safe_exec(cmd: list[str] | str, env: dict[str, str] | None = None, cl
         elif cmd.endswith('blastdb-metadata-1-1.json'):
             manifest = {'nr': {'size': 25}, 'nt': {'size': 25}, 'pdbnt': {'size': 25}, 'testdb': {'size': 25}}
             return MockedCompletedProcess(stdout=json.dumps(manifest))
+        elif cloud_state:
+            # report a missing object the way gsutil does
+            key = cmd.split()[-1]
+            if key in cloud_state.storage:
+                return MockedCompletedProcess(stdout=cloud_state.storage[key])
+            raise SafeExecError(returncode=1, message=f'CommandException: No URLs matched: {key}')
         else:
             return MockedCompletedProcess(stdout='',stderr='',returncode=0)
 
@@ -573,7 +575,7 @@ class GKEMock:
             if opt not in GKEMock.allowed_options:
                 raise ValueError(f'Unsupported GKEMock option: {opt}')
 
-    def mocked_safe_exec(self, cmd, env = None):
+    def mocked_safe_exec(self, cmd, env = None, timeout = None):
         """Mocked util.safe_exec function"""
 
         if isinstance(cmd, list):